@@ -9,26 +9,46 @@ from __future__ import annotations
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+import argparse
+import functools
+import hashlib
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime, date, time, timedelta
+from time import perf_counter
 from bisect import bisect_left, bisect_right
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Any, Callable, Dict, List, Tuple, Optional, Set
 
 import numpy as np
 import pytz
 from ics import Calendar, Event
 from ics.alarm import DisplayAlarm
 from skyfield.api import load, wgs84
+from skyfield.iokit import load_bundled_npy
+from skyfield.jpllib import SpiceKernel
+from skyfield.timelib import Timescale
 from skyfield import almanac
-from skyfield.searchlib import find_discrete
+from skyfield.searchlib import find_discrete as _find_discrete
+from skyfield.nutationlib import iau2000b_radians
+from jplephem.names import target_names
 
 UTC = pytz.UTC
 
 MANUAL_FILE = "manual_events.json"
+EPHEMERIS_FILE = "de421.bsp"
+EXCERPT_FILE = os.environ.get("EPHEMERIS_EXCERPT", "de421-excerpt.bsp")
+# Earth-Moon barycenter, Earth, Moon and Sun, plus Jupiter and Saturn (light deflection in .apparent())
+EXCERPT_TARGETS = (3, 5, 6, 10, 301, 399)
+# Delta-T and leap seconds pinned next to the ephemeris (--build-timescale); OFFLINE=1 refuses
+# to fall back to skyfield's loader, which may download missing files
+TIMESCALE_FILE = os.environ.get("TIMESCALE_FILE", "timescale.npz")
+OFFLINE = os.environ.get("OFFLINE", "0") == "1"
+CACHE_FILE = os.environ.get("TRANSITION_CACHE", os.path.join(".cache", "transitions.npz"))
 DAYS_AHEAD = int(os.environ.get("DAYS_AHEAD", "366"))
-DISCRETE_STEP_DAYS = float(os.environ.get("DISCRETE_STEP_DAYS", "0.04"))
+# The shared sweep reaches back far enough for the lunar (60d) and solar (45d) month look-backs,
+# and at least to January 1 so the current year's Ugadi comes from the tithi table
+HORIZON_BACK_DAYS = 62
 
 # --- Localization Data ---
 
@@ -54,10 +74,15 @@ TRANS = {
     "Sunrise": {"TA": "Surya Udhayam", "TE": "Suryodayam"},
     "Sunset": {"TA": "Surya Asthamanam", "TE": "Suryastamayam"},
     "Moonrise": {"TA": "Chandrodayam", "TE": "Chandrodayam"},
+    "BrahmaMuhurtham": {"TA": "Brahma Muhurtham", "TE": "Brahma Muhurtham"},
+    "Arunodayam": {"TA": "Arunodhayam", "TE": "Arunodayam"},
+    "Twilight": {"TA": "Sandhya (Dawn / Dusk)", "TE": "Sandhya (Dawn / Dusk)"},
     "Chandrashtamam": {"TA": "Chandrashtamam", "TE": "Chandrashtamam"},
     "Soolam": {"TA": "Soolam", "TE": "Soola"},
     "Pariharam": {"TA": "Pariharam", "TE": "Pariharam"},
     "Sradhdha": {"TA": "Sradhdha Thithi", "TE": "Taddinam Tithi"},
+    "Transit": {"TA": "Peyarchi", "TE": "Gocharam"},
+    "Vakram": {"TA": "Vakram", "TE": "Vakram"},
     "Location": {"TA": "Idam", "TE": "Pradesham"},
     "Pada": {"TA": "Paadham", "TE": "Padam"},
 }
@@ -142,6 +167,7 @@ BASE_SAMVATSARA_YEAR = 1987
 LAHIRI_AYANAMSA_DEG_AT_J2000 = float(os.environ.get("LAHIRI_AYANAMSA_DEG_AT_J2000", "23.85675"))
 LAHIRI_AYANAMSA_RATE_DEG_PER_YEAR = float(os.environ.get("LAHIRI_AYANAMSA_RATE_DEG_PER_YEAR", str(50.290966 / 3600.0)))
 J2000_TT = 2451545.0
+J1900_TT = 2415020.0
 
 @dataclass(frozen=True)
 class LocationConfig:
@@ -153,6 +179,7 @@ class LocationConfig:
     out_ics: str
     style: str  # "TAMIL" or "TELUGU"
     lang: str   # "TA" or "TE"
+    topocentric: bool = False  # moon seen from the city rather than the earth's centre (up to ~1°)
 
 LOCATIONS = (
     LocationConfig("stuttgart-ta", "Stuttgart (Tamil Style)", 48.7758, 9.1829, "Europe/Berlin", "Calendar-Stuttgart-Tamil.ics", "TAMIL", "TA"),
@@ -252,25 +279,132 @@ def ascii_table(rows):
         elif v: lines.append(v)
     return "\n".join(lines).strip()
 
+# ------------------------ perf counters ------------------------
+# Calls, evaluated instants and seconds per (caller, location, counter); printed at the end of
+# main() with PERF=1 and written to PERF_JSON when set.  Each caller also gets a "wall" row for
+# the time it held the scope, so phases that only read the tables show up too.
+
+PERF = os.environ.get("PERF") == "1"
+PERF_JSON = os.environ.get("PERF_JSON")
+_PERF: Dict[Tuple[str, str, str], List[float]] = {}
+_PERF_SCOPE: List[Any] = ["main", "-", perf_counter()]
+
+def perf_caller(caller, location="-"):
+    x = perf_counter()
+    perf_count("wall", 0, x - _PERF_SCOPE[2])
+    _PERF_SCOPE[:] = [caller, location, x]
+
+def perf_count(counter, points=1, seconds=0.0):
+    row = _PERF.setdefault((_PERF_SCOPE[0], _PERF_SCOPE[1], counter), [0, 0, 0.0])
+    row[0] += 1; row[1] += points; row[2] += seconds
+
+def body_name(body):
+    return target_names.get(body.target, str(body.target)).lower()
+
+@functools.wraps(_find_discrete)
+def find_discrete(start_time, end_time, f, *args, **kwargs):
+    # Points are the instants f was sampled at, refinement rounds included
+    x, n = perf_counter(), [0]
+    def counted(t):
+        n[0] += np.size(t.tt)
+        return f(t)
+    counted.__dict__.update(f.__dict__)
+    try: return _find_discrete(start_time, end_time, counted, *args, **kwargs)
+    finally: perf_count("find_discrete", n[0], perf_counter() - x)
+
+def perf_report(path=PERF_JSON):
+    perf_caller("main")
+    rows = [{"caller": c, "location": l, "counter": k, "calls": int(v[0]), "points": int(v[1]), "seconds": round(v[2], 4)}
+            for (c, l, k), v in _PERF.items()]
+    print(f"{'caller':<18}{'location':<16}{'counter':<30}{'calls':>8}{'points':>9}{'seconds':>9}")
+    for r in rows:
+        print(f"{r['caller']:<18}{r['location']:<16}{r['counter']:<30}{r['calls']:>8}{r['points']:>9}{r['seconds']:>9.3f}")
+    if path:
+        with open(path, "w") as f: json.dump(rows, f, indent=1)
+
 # ------------------------ astronomy helpers ------------------------
 
 def normalize_deg(x): return np.mod(x, 360.0)
+def wrap180(x): return ((x + 180.0) % 360.0) - 180.0
+
+# ------------------------ ayanamsas ------------------------
+# Every ayanamsa maps TT Julian dates to degrees, so one set of tropical longitudes serves all of them.
+
+@dataclass(frozen=True)
+class LinearAyanamsa:
+    deg_at_epoch: float
+    rate_deg_per_year: float = LAHIRI_AYANAMSA_RATE_DEG_PER_YEAR
+    epoch_tt: float = J2000_TT
+
+    def __call__(self, tt):
+        return self.deg_at_epoch + self.rate_deg_per_year * np.asarray((tt - self.epoch_tt) / 365.2425)
+
+@dataclass(frozen=True)
+class StarAyanamsa:
+    # Pins a star's mean sidereal longitude of date to star_lon (ICRS J2000 place, proper motion)
+    ra_deg: float
+    dec_deg: float
+    pm_ra_mas: float    # mu_alpha * cos(delta)
+    pm_dec_mas: float
+    star_lon: float
+
+    def __call__(self, tt):
+        T = np.asarray(tt - J2000_TT) / 36525.0
+        dec = np.radians(self.dec_deg + self.pm_dec_mas * 100.0 * T / 3.6e6)
+        ra = np.radians(self.ra_deg + self.pm_ra_mas * 100.0 * T / 3.6e6 / np.cos(dec))
+        eps = np.radians(23.4392911)
+        lon = np.degrees(np.arctan2(np.sin(ra) * np.cos(eps) + np.tan(dec) * np.sin(eps), np.cos(ra)))
+        return normalize_deg(lon + precession_in_lon_deg(T) - self.star_lon)
+
+# Raman and KP use the J1900 epoch values of the Swiss Ephemeris sidereal modes
+AYANAMSAS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "lahiri": LinearAyanamsa(LAHIRI_AYANAMSA_DEG_AT_J2000),
+    "raman": LinearAyanamsa(360.0 - 338.98556, epoch_tt=J1900_TT),
+    "kp": LinearAyanamsa(360.0 - 337.636111, epoch_tt=J1900_TT),  # 22°21'50"
+    "true_chitra": StarAyanamsa(201.2982475, -11.1613194, -42.35, -30.67, 180.0),  # Spica at 180°
+}
+AYANAMSA = os.environ.get("AYANAMSA", "lahiri")
+# Extra ayanamsas whose sidereal tables ride along in the same sweep as "<series>@<name>"
+AYANAMSA_SET = tuple(n for n in os.environ.get("AYANAMSA_SET", "").split(",") if n and n != AYANAMSA)
+for _n in (AYANAMSA,) + AYANAMSA_SET:
+    if _n not in AYANAMSAS: raise SystemExit(f"unknown ayanamsa {_n!r}, expected one of {tuple(AYANAMSAS)}")
 
 def ayanamsa_deg(t):
-    years = np.asarray((t.tt - J2000_TT) / 365.2425)
-    return LAHIRI_AYANAMSA_DEG_AT_J2000 + LAHIRI_AYANAMSA_RATE_DEG_PER_YEAR * years
+    return AYANAMSAS[AYANAMSA](t.tt)
 
 def sidereal_lon(lon_deg, t):
     return normalize_deg(np.asarray(lon_deg) - ayanamsa_deg(t))
 
-def sf_to_utc_dt(t) -> datetime:
-    dt = t.utc_datetime()
-    if dt.tzinfo is None: return UTC.localize(dt)
-    return dt.astimezone(UTC)
+# ------------------------ bulk time conversion ------------------------
+# Unix seconds are the pivot: aware datetimes / datetime64 -> seconds -> one vector Time, and back.
+
+def days_from_civil(y, m, d):
+    # Proleptic Gregorian date -> days since 1970-01-01, vectorized (H. Hinnant's algorithm)
+    y = y - (m <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doy = (153 * (m + np.where(m > 2, -3, 9)) + 2) // 5 + d - 1
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
 
-def precompute_discrete(ts, t0_utc, t1_utc, f):
-    times, values = find_discrete(ts.from_datetime(t0_utc), ts.from_datetime(t1_utc), f)
-    return [sf_to_utc_dt(t) for t in times], [int(v) for v in values]
+def utc_seconds(dts) -> np.ndarray:
+    if isinstance(dts, np.ndarray) and np.issubdtype(dts.dtype, np.datetime64):
+        return (dts - np.datetime64(0, "s")) / np.timedelta64(1, "s")
+    return np.array([d.timestamp() for d in dts], dtype=float)
+
+def times_from_seconds(ts, secs):
+    # Whole days go through the calendar so skyfield applies the leap-second offset of each date
+    days, sod = np.divmod(np.asarray(secs, dtype=float), 86400.0)
+    return ts.utc(1970, 1, 1 + days, 0, 0, sod)
+
+def seconds_from_times(t) -> np.ndarray:
+    y, mo, d, h, mi, sec = t.utc
+    return days_from_civil(np.asarray(y, dtype=int), np.asarray(mo, dtype=int), np.asarray(d, dtype=int)) * 86400.0 + h * 3600.0 + mi * 60.0 + sec
+
+def datetimes_from_seconds(secs) -> List[datetime]:
+    return [datetime.fromtimestamp(x, UTC) for x in np.asarray(secs, dtype=float).tolist()]
+
+def times_from_datetimes(ts, dts): return times_from_seconds(ts, utc_seconds(dts))
+def datetimes_from_times(t) -> List[datetime]: return datetimes_from_seconds(np.atleast_1d(seconds_from_times(t)))
 
 def value_at(t_utc, changes, values):
     i = bisect_right(changes, t_utc) - 1
@@ -281,49 +415,440 @@ def transitions_between(a_utc, b_utc, changes, values):
     j = bisect_left(changes, b_utc)
     return [(changes[k], values[k]) for k in range(i, j)]
 
-def tithi_idx(t, earth, sun, moon):
-    e = earth.at(t)
-    _, slon, _ = e.observe(sun).apparent().ecliptic_latlon()
-    _, mlon, _ = e.observe(moon).apparent().ecliptic_latlon()
-    return (normalize_deg(mlon.degrees - slon.degrees) // 12.0).astype(int) + 1
+# Accuracy tier: "exact" observes with .apparent() (aberration, light-time, deflection);
+# "fast" takes geometric positions plus a bounded correction.  Against the exact tier over
+# 2026-2036 the fast residuals stay within ±0.01" for the sun and ±0.06" for the moon.
+ACCURACY_TIERS = ("exact", "fast")
+ACCURACY_TIER = os.environ.get("ACCURACY_TIER", "exact")
+if ACCURACY_TIER not in ACCURACY_TIERS: raise SystemExit(f"ACCURACY_TIER must be one of {ACCURACY_TIERS}")
+SUN_ABERRATION_ARCSEC_AU = -20.4898   # annual aberration, scaled by 1/distance
+MOON_FAST_OFFSET_ARCSEC = -0.703      # mean light-time lag of the apparent moon
+
+# One longitude evaluation per (earth, tier, Time array), shared by every helper below.
+LON_CACHE_SIZE = 64
+_LON_CACHE: Dict[Tuple[int, str, bytes], list] = {}
+
+def apparent_lon(t, earth, body):
+    model = _LON_MODELS.get((id(earth), id(body)))
+    if model is not None:
+        tt = np.asarray(t.tt)
+        inside = model.covers(tt)
+        if np.any(inside):
+            x = perf_counter()
+            lon = model(tt) if np.all(inside) else model(tt[inside])
+            perf_count(f"chebyshev({body_name(body)})", np.size(lon), perf_counter() - x)
+            if np.all(inside): return lon
+            out = np.empty(tt.shape)
+            out[inside] = lon
+            out[~inside] = ephemeris_lon(t.ts.tt_jd(tt[~inside]), earth, body)
+            return out
+    return ephemeris_lon(t, earth, body)
+
+def ephemeris_lon(t, earth, body):
+    if isinstance(body, AnalyticBody): return analytic_lon(t.tt, body.target)
+    key = (id(earth), ACCURACY_TIER, np.asarray(t.tt).tobytes())
+    entry = _LON_CACHE.get(key)
+    if entry is None:
+        if len(_LON_CACHE) >= LON_CACHE_SIZE: _LON_CACHE.pop(next(iter(_LON_CACHE)))
+        entry = _LON_CACHE[key] = [None, {}]
+    lons = entry[1]
+    lon = lons.get(id(body))
+    if lon is not None: return lon
+    x = perf_counter()
+    if ACCURACY_TIER == "fast":
+        _, l, dist = (body - earth).at(t).ecliptic_latlon()
+        lon = l.degrees
+        if body.target == 10: lon = lon + SUN_ABERRATION_ARCSEC_AU / dist.au / 3600.0
+        elif body.target == 301: lon = lon + MOON_FAST_OFFSET_ARCSEC / 3600.0
+    else:
+        if entry[0] is None: entry[0] = earth.at(t)
+        _, l, _ = entry[0].observe(body).apparent().ecliptic_latlon()
+        lon = l.degrees
+    perf_count(f"{'at' if ACCURACY_TIER == 'fast' else 'observe'}({body_name(body)})", np.size(lon), perf_counter() - x)
+    lons[id(body)] = lon
+    return lon
+
+def set_accuracy_tier(tier):
+    global ACCURACY_TIER
+    ACCURACY_TIER = tier
+    _LON_CACHE.clear()
+    _LON_MODELS.clear()
+
+def sun_moon_lon(t, earth, sun, moon):
+    return apparent_lon(t, earth, sun), apparent_lon(t, earth, moon)
+
+# ------------------------ analytic sun/moon theory ------------------------
+# BSP-free backend: the sun from Meeus' abridged VSOP87 Earth series (Astronomical Algorithms,
+# appendix III), the moon from the truncated ELP-2000/82 series of Meeus ch. 47.  Both are
+# reduced to the frame the kernel path reports (apparent, J2000 ecliptic).  Against DE421 over
+# 1900-2050 the sun stays within ±0.8" and the moon within ±20".
+
+EPHEMERIS_BACKENDS = ("bsp", "analytic")
+EPHEMERIS_BACKEND = os.environ.get("EPHEMERIS_BACKEND", "bsp")
+if EPHEMERIS_BACKEND not in EPHEMERIS_BACKENDS:
+    raise SystemExit(f"EPHEMERIS_BACKEND must be one of {EPHEMERIS_BACKENDS}, got {EPHEMERIS_BACKEND!r}")
+def use_analytic_backend():
+    global EPHEMERIS_BACKEND
+    EPHEMERIS_BACKEND = "analytic"
+
+# Measured with --accuracy-report over 2026-2032: every transition keeps its value, moon-driven
+# series move by at most ~25 s (mean ~5 s) and solar rasi ingresses by at most ~6 s.
+
+@dataclass(frozen=True)
+class AnalyticBody:
+    target: int  # NAIF code, as on the kernel's bodies
+
+ANALYTIC_BODIES = {"earth": AnalyticBody(399), "sun": AnalyticBody(10), "moon": AnalyticBody(301)}
+
+# (A, B, C) per term, summed as A cos(B + C tau) for tau in Julian millennia, units 1e-8
+VSOP87_EARTH_L = [np.array(x, dtype=float) for x in (
+    [(175347046, 0, 0), (3341656, 4.6692568, 6283.07585), (34894, 4.62610, 12566.15170), (3497, 2.7441, 5753.3849),
+     (3418, 2.8289, 3.5231), (3136, 3.6277, 77713.7715), (2676, 4.4181, 7860.4194), (2343, 6.1352, 3930.2097),
+     (1324, 0.7425, 11506.7698), (1273, 2.0371, 529.6910), (1199, 1.1096, 1577.3435), (990, 5.233, 5884.927),
+     (902, 2.045, 26.298), (857, 3.508, 398.149), (780, 1.179, 5223.694), (753, 2.533, 5507.553),
+     (505, 4.583, 18849.228), (492, 4.205, 775.523), (357, 2.920, 0.067), (317, 5.849, 11790.629),
+     (284, 1.899, 796.298), (271, 0.315, 10977.079), (243, 0.345, 5486.778), (206, 4.806, 2544.314),
+     (205, 1.869, 5573.143), (202, 2.458, 6069.777), (156, 0.833, 213.299), (132, 3.411, 2942.463),
+     (126, 1.083, 20.775), (115, 0.645, 0.980), (103, 0.636, 4694.003), (102, 0.976, 15720.839),
+     (102, 4.267, 7.114), (99, 6.21, 2146.17), (98, 0.68, 155.42), (86, 5.98, 161000.69),
+     (85, 1.30, 6275.96), (85, 3.67, 71430.70), (80, 1.81, 17260.15), (79, 3.04, 12036.46),
+     (75, 1.76, 5088.63), (74, 3.50, 3154.69), (74, 4.68, 801.82), (70, 0.83, 9437.76),
+     (62, 3.98, 8827.39), (61, 1.82, 7084.90), (57, 2.78, 6286.60), (56, 4.39, 14143.50),
+     (56, 3.47, 6279.55), (52, 0.19, 12139.55), (52, 1.33, 1748.02), (51, 0.28, 5856.48),
+     (49, 0.49, 1194.45), (41, 5.37, 8429.24), (41, 2.40, 19651.05), (39, 6.17, 10447.39),
+     (37, 6.04, 10213.29), (37, 2.57, 1059.38), (36, 1.71, 2352.87), (36, 1.78, 6812.77),
+     (33, 0.59, 17789.85), (30, 0.44, 83996.85), (30, 2.74, 1349.87), (25, 3.16, 4690.48)],
+    [(628331966747, 0, 0), (206059, 2.678235, 6283.07585), (4303, 2.6351, 12566.1517), (425, 1.590, 3.523),
+     (119, 5.796, 26.298), (109, 2.966, 1577.344), (93, 2.59, 18849.23), (72, 1.14, 529.69),
+     (68, 1.87, 398.15), (67, 4.41, 5507.55), (59, 2.89, 5223.69), (56, 2.17, 155.42),
+     (45, 0.40, 796.30), (36, 0.47, 775.52), (29, 2.65, 7.11), (21, 5.34, 0.98),
+     (19, 1.85, 5486.78), (19, 4.97, 213.30), (17, 2.99, 6275.96), (16, 0.03, 2544.31),
+     (16, 1.43, 2146.17), (15, 1.21, 10977.08), (12, 2.83, 1748.02), (12, 3.26, 5088.63),
+     (12, 5.27, 1194.45), (12, 2.08, 4694.00), (11, 0.77, 553.57), (10, 1.30, 6286.60),
+     (10, 4.24, 1349.87), (9, 2.70, 242.73), (9, 5.64, 951.72), (8, 5.30, 2352.87),
+     (6, 2.65, 9437.76), (6, 4.67, 4690.48)],
+    [(52919, 0, 0), (8720, 1.0721, 6283.0758), (309, 0.867, 12566.152), (27, 0.05, 3.52),
+     (16, 5.19, 26.30), (16, 3.68, 155.42), (10, 0.76, 18849.23), (9, 2.06, 77713.77),
+     (7, 0.83, 775.52), (5, 4.66, 1577.34), (4, 1.03, 7.11), (4, 3.44, 5573.14),
+     (3, 5.14, 796.30), (3, 6.05, 5507.55), (3, 1.19, 242.73), (3, 6.12, 529.69),
+     (3, 0.31, 398.15), (3, 2.28, 553.57), (2, 4.38, 5223.69), (2, 3.75, 0.98)],
+    [(289, 5.844, 6283.076), (35, 0, 0), (17, 5.49, 12566.15), (3, 5.20, 155.42),
+     (1, 4.72, 3.52), (1, 5.30, 18849.23), (1, 5.97, 242.73)],
+    [(114, 3.142, 0), (8, 4.13, 6283.08), (1, 3.84, 12566.15)],
+    [(1, 3.14, 0)],
+)]
+VSOP87_EARTH_R = [np.array(x, dtype=float) for x in (
+    [(100013989, 0, 0), (1670700, 3.0984635, 6283.0758500), (13956, 3.05525, 12566.15170), (3084, 5.1985, 77713.7715),
+     (1628, 1.1739, 5753.3849), (1576, 2.8469, 7860.4194), (925, 5.453, 11506.770), (542, 4.564, 3930.210),
+     (472, 3.661, 5884.927), (346, 0.964, 5507.553), (329, 5.900, 5223.694), (307, 0.299, 5573.143),
+     (243, 4.273, 11790.629), (212, 5.847, 1577.344), (186, 5.022, 10977.079), (175, 3.012, 18849.228),
+     (110, 5.055, 5486.778), (98, 0.89, 6069.78), (86, 5.69, 15720.84), (86, 1.27, 161000.69),
+     (65, 0.27, 17260.15), (63, 0.92, 529.69), (57, 2.01, 83996.85), (56, 5.24, 71430.70),
+     (49, 3.25, 2544.31), (47, 2.58, 775.52), (45, 5.54, 9437.76), (43, 6.01, 6275.96),
+     (39, 5.36, 4694.00), (38, 2.39, 8827.39), (37, 0.83, 19651.05), (37, 4.90, 12139.55),
+     (36, 1.67, 12036.46), (35, 1.84, 2942.46), (33, 0.24, 7084.90), (32, 0.18, 5088.63),
+     (32, 1.78, 398.15), (28, 1.21, 6286.60), (28, 1.90, 6279.55), (26, 4.59, 10447.39)],
+    [(103019, 1.107490, 6283.075850), (1721, 1.0644, 12566.1517), (702, 3.142, 0), (32, 1.02, 18849.23),
+     (31, 2.84, 5507.55), (25, 1.32, 5223.69), (18, 1.42, 1577.34), (10, 5.91, 10977.08),
+     (9, 1.42, 6275.96), (9, 0.27, 5486.78)],
+    [(4359, 5.7846, 6283.0758), (124, 5.579, 12566.152), (12, 3.14, 0), (9, 3.63, 77713.77),
+     (6, 1.87, 5573.14), (3, 5.47, 18849.23)],
+    [(145, 4.273, 6283.076), (7, 3.92, 12566.15)],
+    [(4, 2.56, 6283.08)],
+)]
+
+# Meeus table 47.A: multiples of (D, M, M', F) and the sine coefficient in 1e-6 degrees
+ELP_MOON_LON = np.array([
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314), (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332), (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322), (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528), (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034), (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766), (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665), (0, 1, -2, 0, -2689),
+    (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390), (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236),
+    (0, 1, 2, 0, -2120), (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110), (3, 0, -1, 0, -892),
+    (2, 1, 1, 0, -810), (4, -1, -2, 0, 759), (0, 2, -1, 0, -713), (2, 2, -1, 0, -700),
+    (2, 1, -2, 0, 691), (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399), (0, 0, 2, -2, -381),
+    (1, 1, 1, 0, 351), (3, 0, -2, 0, -340), (4, 0, -3, 0, 330), (2, -1, 2, 0, 327),
+    (0, 2, 1, 0, -323), (1, 1, -1, 0, 299), (2, 0, 3, 0, 294),
+], dtype=float)
+
+def vsop_series(series, tau):
+    out = 0.0
+    for i, terms in enumerate(series):
+        out = out + np.sum(terms[:, 0] * np.cos(terms[:, 1] + np.multiply.outer(tau, terms[:, 2])), axis=-1) * tau**i
+    return out / 1e8
+
+def precession_in_lon_deg(T):
+    return (5029.0966 * T + 1.11113 * T**2) / 3600.0
+
+def analytic_sun_lon(tt):
+    tau = (np.asarray(tt, dtype=float) - J2000_TT) / 365250.0
+    lon = np.degrees(vsop_series(VSOP87_EARTH_L, tau)) + 180.0 - 0.09033 / 3600.0  # FK5 correction
+    r = vsop_series(VSOP87_EARTH_R, tau)
+    return normalize_deg(lon - precession_in_lon_deg(10.0 * tau) + SUN_ABERRATION_ARCSEC_AU / r / 3600.0)
+
+def analytic_moon_lon(tt):
+    T = (np.asarray(tt, dtype=float) - J2000_TT) / 36525.0
+    Lp = 218.3164477 + 481267.88123421*T - 0.0015786*T**2 + T**3/538841.0 - T**4/65194000.0
+    D = 297.8501921 + 445267.1114034*T - 0.0018819*T**2 + T**3/545868.0 - T**4/113065000.0
+    M = 357.5291092 + 35999.0502909*T - 0.0001536*T**2 + T**3/24490000.0
+    Mp = 134.9633964 + 477198.8675055*T + 0.0087414*T**2 + T**3/69699.0 - T**4/14712000.0
+    F = 93.2720950 + 483202.0175233*T - 0.0036539*T**2 - T**3/3526000.0 + T**4/863310000.0
+    E = 1.0 - 0.002516*T - 0.0000074*T**2
+    c = ELP_MOON_LON
+    arg = np.radians(np.multiply.outer(D, c[:, 0]) + np.multiply.outer(M, c[:, 1])
+                     + np.multiply.outer(Mp, c[:, 2]) + np.multiply.outer(F, c[:, 3]))
+    sl = np.sum(c[:, 4] * np.power.outer(E, np.abs(c[:, 1])) * np.sin(arg), axis=-1)
+    sl = sl + 3958.0*np.sin(np.radians(119.75 + 131.849*T)) + 1962.0*np.sin(np.radians(Lp - F)) \
+            + 318.0*np.sin(np.radians(53.09 + 479264.290*T))
+    return normalize_deg(Lp + sl / 1e6 - precession_in_lon_deg(T) + MOON_FAST_OFFSET_ARCSEC / 3600.0)
+
+def analytic_lon(tt, target):
+    if target == 10: return analytic_sun_lon(tt)
+    if target == 301: return analytic_moon_lon(tt)
+    raise ValueError(f"no analytic theory for body {target}")
+
+# ------------------------ Chebyshev longitude model ------------------------
+
+USE_CHEB_MODEL = os.environ.get("CHEB_MODEL", "1") != "0"
+CHEB_SEGMENT_DAYS = float(os.environ.get("CHEB_SEGMENT_DAYS", "4.0"))
+CHEB_TOPO_SEGMENT_DAYS = float(os.environ.get("CHEB_TOPO_SEGMENT_DAYS", "0.5"))
+CHEB_DEGREE = int(os.environ.get("CHEB_DEGREE", "12"))
+
+@dataclass
+class ChebLonModel:
+    tt0: float
+    seg_days: float
+    coeffs: np.ndarray      # (segments, degree+1), unwrapped degrees
+    max_err_deg: float      # worst residual at the between-node check points
+
+    @property
+    def tt1(self): return self.tt0 + self.seg_days * len(self.coeffs)
+
+    def covers(self, tt): return (tt >= self.tt0) & (tt <= self.tt1)
+
+    def __call__(self, tt):
+        tt = np.asarray(tt, dtype=float)
+        seg = np.clip(((tt - self.tt0) // self.seg_days).astype(int), 0, len(self.coeffs) - 1)
+        x = 2.0 * (tt - self.tt0 - seg * self.seg_days) / self.seg_days - 1.0
+        c = self.coeffs[seg]
+        # Clenshaw recurrence, one coefficient row per sample
+        b1 = b2 = np.zeros(tt.shape)
+        for k in range(c.shape[-1] - 1, 0, -1):
+            b1, b2 = 2.0 * x * b1 - b2 + c[..., k], b1
+        return normalize_deg(x * b1 - b2 + c[..., 0])
+
+_LON_MODELS: Dict[Tuple[int, int], ChebLonModel] = {}  # (id(observer), id(body))
+
+def fit_lon_models(ts, earth, sun, moon, t0_utc, t1_utc, seg_days=CHEB_SEGMENT_DAYS, deg=CHEB_DEGREE):
+    tt0, tt1 = ts.from_datetime(t0_utc).tt, ts.from_datetime(t1_utc).tt
+    nseg = int(np.ceil((tt1 - tt0) / seg_days))
+    nodes = np.sort(np.cos(np.pi * (np.arange(deg + 1) + 0.5) / (deg + 1)))
+    checks = (nodes[:-1] + nodes[1:]) / 2.0
+    x = np.sort(np.concatenate([nodes, checks]))
+    is_node = np.isin(x, nodes)
+    starts = tt0 + seg_days * np.arange(nseg)
+    t = ts.tt_jd((starts[:, None] + (x[None, :] + 1.0) * seg_days / 2.0).ravel())
+    models = {}
+    for body, lon in zip((sun, moon), sun_moon_lon(t, earth, sun, moon)):
+        lon = np.unwrap(lon.reshape(nseg, -1), period=360.0, axis=1)
+        coeffs = np.polynomial.chebyshev.chebfit(x[is_node], lon[:, is_node].T, deg).T
+        fit = np.polynomial.chebyshev.chebval(x[~is_node], coeffs.T)
+        err = float(np.max(np.abs(fit.T - lon[:, ~is_node].T))) if nseg else 0.0
+        models[(id(earth), id(body))] = ChebLonModel(float(tt0), seg_days, coeffs, err)
+    return models
+
+def install_lon_models(models):
+    _LON_MODELS.update(models)
 
 def nak_idx(t, earth, moon):
-    e = earth.at(t)
-    _, mlon, _ = e.observe(moon).apparent().ecliptic_latlon()
-    return (sidereal_lon(mlon.degrees, t) // (360.0/27.0)).astype(int) + 1
-
-def calculate_pada(t, earth, moon):
-    e = earth.at(t)
-    _, mlon, _ = e.observe(moon).apparent().ecliptic_latlon()
-    s_lon = sidereal_lon(mlon.degrees, t)
-    nak_start_deg = (s_lon // (360.0/27.0)) * (360.0/27.0)
-    deg_in_nak = s_lon - nak_start_deg
-    pada = int(deg_in_nak / (360.0/108.0)) + 1
-    if pada > 4: pada = 4
-    return pada
-
-def yoga_idx(t, earth, sun, moon):
-    e = earth.at(t)
-    _, slon, _ = e.observe(sun).apparent().ecliptic_latlon()
-    _, mlon, _ = e.observe(moon).apparent().ecliptic_latlon()
-    total = normalize_deg(sidereal_lon(slon.degrees, t) + sidereal_lon(mlon.degrees, t))
-    return (total // (360.0/27.0)).astype(int) + 1
+    return (sidereal_lon(apparent_lon(t, earth, moon), t) // (360.0/27.0)).astype(int) + 1
 
 def solar_rasi_idx(t, earth, sun):
-    e = earth.at(t)
-    _, slon, _ = e.observe(sun).apparent().ecliptic_latlon()
-    return (sidereal_lon(slon.degrees, t) // 30.0).astype(int)
+    return (sidereal_lon(apparent_lon(t, earth, sun), t) // 30.0).astype(int)
+
+def sunrise_quantities(t_sr, earth, sun, moon) -> Dict[str, np.ndarray]:
+    # Everything the daily render needs at sunrise, for a whole vector of sunrises at once
+    slon, mlon = sun_moon_lon(t_sr, earth, sun, moon)
+    return {"sun_lon": slon, "moon_rasi": (sidereal_lon(mlon, t_sr) // 30.0).astype(int)}
 
-def moon_rasi_idx(t, earth, moon):
-    e = earth.at(t)
-    _, mlon, _ = e.observe(moon).apparent().ecliptic_latlon()
-    return (sidereal_lon(mlon.degrees, t) // 30.0).astype(int)
+# ------------------------ transition engine ------------------------
 
-def karana_num(t, earth, sun, moon):
-    e = earth.at(t)
-    _, slon, _ = e.observe(sun).apparent().ecliptic_latlon()
-    _, mlon, _ = e.observe(moon).apparent().ecliptic_latlon()
-    return (normalize_deg(mlon.degrees - slon.degrees) // 6.0).astype(int) + 1
+ROOT_GRID_DAYS = float(os.environ.get("ROOT_GRID_DAYS", "1.0"))
+ROOT_TOL_SECONDS = float(os.environ.get("ROOT_TOL_SECONDS", "0.001"))
+ROOT_MAX_ITER = 60
+
+@dataclass(frozen=True)
+class AngularSeries:
+    # value = floor(angle / width) mod count + offset, with angle non-decreasing in time
+    name: str
+    width: float
+    count: int
+    offset: int
+    angle: Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]  # (slon, mlon, ayanamsa) -> degrees
+    sidereal: bool = True
+    ayanamsa: Optional[str] = None  # None: the configured AYANAMSA
+
+    def value(self, k): return (np.asarray(k) % self.count + self.offset).astype(int)
+
+TITHI = AngularSeries("tithi", 12.0, 30, 1, lambda s, m, a: m - s, sidereal=False)
+KARANA = AngularSeries("karana", 6.0, 60, 1, lambda s, m, a: m - s, sidereal=False)
+NAKSHATRA = AngularSeries("nakshatra", 360.0/27.0, 27, 1, lambda s, m, a: m - a)
+PADA = AngularSeries("pada", 360.0/108.0, 108, 1, lambda s, m, a: m - a)
+YOGA = AngularSeries("yoga", 360.0/27.0, 27, 1, lambda s, m, a: s + m - 2.0 * a)
+SOLAR_RASI = AngularSeries("solar_rasi", 30.0, 12, 0, lambda s, m, a: s - a)
+MOON_RASI = AngularSeries("moon_rasi", 30.0, 12, 0, lambda s, m, a: m - a)
+ALL_SERIES = (TITHI, KARANA, NAKSHATRA, PADA, YOGA, SOLAR_RASI, MOON_RASI)
+SYZYGY = AngularSeries("syzygy", 180.0, 2, 0, lambda s, m, a: m - s, sidereal=False)  # 0 new moon, 1 full moon
+# What a topocentric location takes from its own sweep: the moon's place among the stars.  Tithi,
+# karana, yoga and syzygies stay geocentric, as every almanac reckons them
+TOPO_SERIES = (NAKSHATRA, PADA, MOON_RASI)
+
+def ayanamsa_series(names, series=ALL_SERIES) -> Tuple[AngularSeries, ...]:
+    return tuple(replace(ser, name=f"{ser.name}@{n}", ayanamsa=n) for n in names for ser in series if ser.sidereal)
+
+Transitions = Tuple[List[datetime], List[int]]
+
+def sweep_transitions(ts, t0_utc, t1_utc, earth, sun, moon, series=ALL_SERIES,
+                      grid_days=ROOT_GRID_DAYS, tol_s=ROOT_TOL_SECONDS) -> Dict[str, Transitions]:
+    """
+    Finds every boundary crossing of each series in [t0, t1] from one shared sweep.  Sun and
+    moon are sampled once on a coarse grid (far coarser than any series' mean motion per
+    step), each crossed multiple of a series' width is bracketed between two grid points, and
+    all crossings of all series are then refined together with Illinois regula falsi.
+    Returns {series.name: (changes, values)} in the form value_at/transitions_between expect.
+    """
+    tt0, tt1 = ts.from_datetime(t0_utc).tt, ts.from_datetime(t1_utc).tt
+    grid = np.append(np.arange(tt0, tt1, grid_days), tt1)
+    t = ts.tt_jd(grid)
+    slon, mlon = sun_moon_lon(t, earth, sun, moon)
+    ayas = [AYANAMSAS[ser.ayanamsa or AYANAMSA] for ser in series]
+
+    idx, sid, kk, fa, fb = [], [], [], [], []
+    for j, ser in enumerate(series):
+        ang = np.unwrap(ser.angle(slon, mlon, ayas[j](grid)), period=360.0)
+        k = np.floor(ang / ser.width).astype(int)
+        steps = np.maximum(np.diff(k), 0)
+        i = np.repeat(np.arange(len(steps)), steps)
+        # the n-th crossing inside a grid step targets k[i] + 1 + n
+        kj = k[i] + 1 + (np.arange(len(i)) - (np.cumsum(steps) - steps)[i])
+        idx.append(i); sid.append(np.full(len(i), j)); kk.append(kj)
+        fa.append(ang[i] - kj * ser.width); fb.append(ang[i + 1] - kj * ser.width)
+    idx, sid, kk = np.concatenate(idx), np.concatenate(sid), np.concatenate(kk)
+    fa, fb = np.concatenate(fa), np.concatenate(fb)
+    widths = np.array([ser.width for ser in series])
+    target = kk * widths[sid]
+
+    a, b = grid[idx], grid[idx + 1]
+    c = b.copy()
+    side = np.zeros(len(idx), dtype=int)
+    active = np.ones(len(idx), dtype=bool)
+    tol_days = tol_s / 86400.0
+    for _ in range(ROOT_MAX_ITER):
+        if not active.any(): break
+        act = np.where(active)[0]
+        denom = np.where(fb[act] != fa[act], fb[act] - fa[act], 1.0)
+        cc = np.clip(b[act] - fb[act] * (b[act] - a[act]) / denom, a[act], b[act])
+        tx = ts.tt_jd(cc)
+        sl, ml = sun_moon_lon(tx, earth, sun, moon)
+        fc = np.empty(len(act))
+        for j, ser in enumerate(series):
+            m = sid[act] == j
+            if m.any(): fc[m] = ser.angle(sl[m], ml[m], ayas[j](cc[m]))
+        fc = wrap180(fc - target[act])
+        low = fc < 0
+        ai, bi = act[low], act[~low]
+        # Illinois: halve the stale endpoint when the same side is kept twice
+        fb[ai] = np.where(side[ai] == -1, fb[ai] / 2.0, fb[ai])
+        fa[bi] = np.where(side[bi] == 1, fa[bi] / 2.0, fa[bi])
+        a[ai], fa[ai], side[ai] = cc[low], fc[low], -1
+        b[bi], fb[bi], side[bi] = cc[~low], fc[~low], 1
+        done = (np.abs(cc - c[act]) < tol_days) | (b[act] - a[act] < tol_days) | (fc == 0)
+        c[act] = cc
+        active[act[done]] = False
+
+    times = datetimes_from_times(ts.tt_jd(c)) if len(c) else []
+    out = {}
+    for j, ser in enumerate(series):
+        sel = np.where(sid == j)[0]
+        sel = sel[np.argsort(c[sel], kind="stable")]
+        out[ser.name] = ([times[i] for i in sel], [int(v) for v in ser.value(kk[sel])])
+    return out
+
+# ------------------------ planetary transits ------------------------
+# Guru and Sani turn retrograde every year and can cross one rasi boundary three times around
+# a station, so unlike the sweep above this search does not assume a non-decreasing angle.
+# Rahu/Ketu are the mean nodes.
+
+TRANSIT_BODIES = ("Guru", "Sani", "Rahu", "Ketu")
+TRANSIT_STEP_DAYS = {"Guru": 4.0, "Sani": 8.0, "Rahu": 16.0, "Ketu": 16.0}
+STATION_SUBSTEPS = 48
+
+def mean_node_lon(t):
+    # Meeus (47.7), of date, carried into the J2000 frame of the other longitudes
+    T = (np.asarray(t.tt) - J2000_TT) / 36525.0
+    om = 125.0445479 - 1934.1362891*T + 0.0020754*T**2 + T**3/467441.0 - T**4/60616000.0
+    return normalize_deg(om - precession_in_lon_deg(T))
+
+def transit_lon_fns(planets) -> Dict[str, Callable]:
+    # The nodes are analytic; Guru and Sani need the kernel
+    fns = {"Rahu": mean_node_lon, "Ketu": lambda t: normalize_deg(mean_node_lon(t) + 180.0)}
+    planets = opened(planets)
+    if planets is None: return fns
+    earth, jup, sat = planets["earth"], planets["jupiter barycenter"], planets["saturn barycenter"]
+    return {"Guru": lambda t: apparent_lon(t, earth, jup), "Sani": lambda t: apparent_lon(t, earth, sat), **fns}
+
+def slow_transits(ts, t0_utc, t1_utc, lon_fn, step_days, tol_s=ROOT_TOL_SECONDS) -> Tuple[Transitions, List[int]]:
+    """
+    Sidereal rasi ingresses of a slow body in [t0, t1], and 1 for each one made in retrograde
+    motion.  A coarse grid is resampled finely around every station (where the motion changes
+    sign), so crossings back and forth near a station land in separate brackets; all brackets
+    are then bisected together.
+    """
+    tt0, tt1 = ts.from_datetime(t0_utc).tt, ts.from_datetime(t1_utc).tt
+    grid = np.append(np.arange(tt0, tt1, step_days), tt1)
+    aya = AYANAMSAS[AYANAMSA]
+    sid = lambda tt: lon_fn(ts.tt_jd(tt)) - aya(tt)
+    raw = sid(grid)
+    d = np.diff(np.unwrap(raw, period=360.0))
+    st = np.nonzero(np.sign(d[:-1]) != np.sign(d[1:]))[0]
+    if len(st):
+        fine = np.unique(np.concatenate([np.linspace(grid[i], grid[i + 2], 2 * STATION_SUBSTEPS + 1)[1:-1] for i in st]))
+        fine = fine[~np.isin(fine, grid)]
+        grid, raw = np.concatenate([grid, fine]), np.concatenate([raw, sid(fine)])
+        order = np.argsort(grid)
+        grid, raw = grid[order], raw[order]
+    k = np.floor(np.unwrap(raw, period=360.0) / 30.0).astype(int)
+    i = np.nonzero(np.diff(k))[0]
+    up = k[i + 1] > k[i]
+    target = np.where(up, k[i + 1], k[i]) * 30.0  # a step never spans a whole rasi
+    a, b = grid[i], grid[i + 1]
+    fa = wrap180(raw[i] - target)
+    tol_days = tol_s / 86400.0
+    while len(a) and np.max(b - a) > tol_days:
+        mid = (a + b) / 2.0
+        fm = wrap180(sid(mid) - target)
+        left = np.sign(fm) == np.sign(fa)
+        a, fa, b = np.where(left, mid, a), np.where(left, fm, fa), np.where(left, b, mid)
+    times = datetimes_from_times(ts.tt_jd((a + b) / 2.0)) if len(a) else []
+    return (times, [int(v) for v in k[i + 1] % 12]), [int(x) for x in ~up]
+
+def planet_transits(ts, t0_utc, t1_utc, planets) -> Dict[str, Transitions]:
+    # {body: (ingresses, rasi)} plus {body_retro: (ingresses, 0/1)}
+    out = {}
+    for name, fn in transit_lon_fns(planets).items():
+        (times, values), retro = slow_transits(ts, t0_utc, t1_utc, fn, TRANSIT_STEP_DAYS[name])
+        out[name], out[f"{name}_retro"] = (times, values), (times, retro)
+    return out
+
+def transit_title(body, rasi, retro, lang):
+    prev = (rasi + 1) % 12 if retro else (rasi - 1) % 12
+    vakram = f" ({get_label('Vakram', lang)})" if retro and body in ("Guru", "Sani") else ""
+    return f"🪐 {body} {get_label('Transit', lang)}{vakram}: {rasi_name(prev, lang)} → {rasi_name(rasi, lang)}"
 
 def karana_name(n: int) -> str:
     if n == 1: return "Kimstughna"
@@ -343,20 +868,21 @@ def weekday_name(d, lang): return get_name(WEEKDAY_NAMES, d.weekday(), lang)
 def paksha(i, lang): return get_name(PAKSHA_NAMES, 0 if i <= 15 else 1, lang)
 def get_ritu(idx, is_solar, lang): return get_name(RITU_NAMES, (idx // 2) % 6, lang)
 
-def ayanam_name(t, earth, sun, lang) -> str:
-    e = earth.at(t)
-    _, slon, _ = e.observe(sun).apparent().ecliptic_latlon()
-    lon = float(normalize_deg(slon.degrees))
+def ayanam_name(sun_lon, lang) -> str:
+    lon = float(normalize_deg(sun_lon))
     return "Dakshinayanam" if (90.0 <= lon < 270.0) else "Uttarayanam"
 
 def describe_trans(start, trans, connector):
+    # Karana can change three times between sunrises, so chain however many there are
     if not trans: return start
-    if len(trans) == 1:
-        t1, v2 = trans[0]
-        return f"upto {fmt_time(t1)} {start}, {connector} {v2}"
-    t1, v2 = trans[0]
-    t2, v3 = trans[1]
-    return f"upto {fmt_time(t1)} {start}, upto {fmt_time(t2)} {v2}, {connector} {v3}"
+    names = [start] + [v for _, v in trans]
+    parts = [f"upto {fmt_time(t)} {n}" for (t, _), n in zip(trans, names)]
+    return ", ".join(parts) + f", {connector} {names[-1]}"
+
+def pada_changes(a_utc, b_utc, nak, pada: Transitions) -> List[Tuple[datetime, int]]:
+    # Pada changes in (a, b) that still belong to nakshatra nak; the pada and nakshatra tables
+    # each find the shared boundary on their own, so compare values rather than instants
+    return [(t, v) for t, v in transitions_between(a_utc, b_utc, *pada) if (v - 1) // 4 + 1 == nak]
 
 # ------------------------ Special Times ------------------------
 
@@ -388,6 +914,14 @@ def durmuhurtham(d, sunrise, sunset):
         res.append(fmt_interval(s, e))
     return ", ".join(res) if res else "N/A"
 
+def twilight_str(riseset, d):
+    # Dawn / dusk per twilight; the sun not getting that low leaves N/A
+    parts = []
+    for name in TWILIGHTS:
+        dawn, dusk = riseset.twilight(name, d)
+        parts.append(f"{name.title()} {fmt_time(dawn) if dawn else 'N/A'} / {fmt_time(dusk) if dusk else 'N/A'}")
+    return ", ".join(parts)
+
 def abhijit_muhurtham(sunrise, sunset):
     L = (sunset - sunrise).total_seconds()
     part = L / 15.0
@@ -465,21 +999,29 @@ def chandhirashtamam_target(moon_rasi_idx_now, lang):
 
 # ------------------------ Moonrise & Vratam Logic ------------------------
 
-def calculate_moonrise(d, loc, ts, planets):
-    # Calculate moonrise for the given civil date
+def moon_events(ts, planets, loc, t0_utc, t1_utc) -> Transitions:
+    # Every moonrise (1) and moonset (0) in the window, one search
+    f = almanac.risings_and_settings(planets, planets['moon'], wgs84.latlon(loc.lat, loc.lon))
+    times, states = find_discrete(ts.from_datetime(t0_utc), ts.from_datetime(t1_utc), f)
+    return datetimes_from_times(times), [int(st) for st in states]
+
+def moon_events_range(ts, planets, loc, start_d, end_d, cache=None):
+    # First moonrise / moonset of each local civil date; days without one are absent, as is
+    # every day when there is no kernel
+    if opened(planets) is None: return {}, {}
     tz = pytz.timezone(loc.tz)
-    location = wgs84.latlon(loc.lat, loc.lon)
-    t0 = tz.localize(datetime.combine(d, time(0,0))).astimezone(UTC)
-    t1 = tz.localize(datetime.combine(d+timedelta(days=1), time(0,0))).astimezone(UTC)
-    
-    f = almanac.risings_and_settings(planets, planets['moon'], location)
-    times, values = find_discrete(ts.from_datetime(t0), ts.from_datetime(t1), f)
-    
-    # values: true=rise, false=set
-    for t, is_rise in zip(times, values):
-        if is_rise:
-            return sf_to_utc_dt(t).astimezone(tz)
-    return None
+    t0 = tz.localize(datetime.combine(start_d-timedelta(days=1), time(0,0))).astimezone(UTC)
+    t1 = tz.localize(datetime.combine(end_d+timedelta(days=2), time(0,0))).astimezone(UTC)
+    if cache is None:
+        times, states = moon_events(ts, planets, loc, t0, t1)
+    else:
+        group = f"moonriseset_{loc.lat:.5f}_{loc.lon:.5f}"
+        times, states = cached_transitions(cache, group, t0, t1, lambda a, b: {"moon": moon_events(ts, planets, loc, a, b)})["moon"]
+    moonr, moons = {}, {}
+    for t, st in zip(times, states):
+        dt = t.astimezone(tz)
+        (moonr if int(st) == 1 else moons).setdefault(dt.date(), dt)
+    return moonr, moons
 
 def get_tithi_span(target_tithi: int, search_center: datetime, changes: List[datetime], values: List[int]) -> Optional[Tuple[datetime, datetime]]:
     """
@@ -504,7 +1046,8 @@ def get_tithi_span(target_tithi: int, search_center: datetime, changes: List[dat
     end_time = changes[idx+1] if (idx + 1) < len(changes) else search_center + timedelta(hours=24)
     return start_time, end_time
 
-def check_rich_festivals(loc, d, s_data, l_data, t_now, n_now) -> List[DisplayEvent]:
+def check_rich_festivals(loc, d, s_data, l_data, t_now, n_now, next_purnima: Optional[datetime]) -> List[DisplayEvent]:
+    # next_purnima: the first full moon in the week after sunrise, if any
     hits = []
     rules = FESTIVALS_TE if loc.style == "TELUGU" else FESTIVALS_TA
     s_mname, s_day, _, _ = s_data or ("", 0, "", 0)
@@ -541,10 +1084,8 @@ def check_rich_festivals(loc, d, s_data, l_data, t_now, n_now) -> List[DisplayEv
                 # Check if today is Friday (4)
                 if d.weekday() == 4:
                     # Is it the last Friday before Purnima?
-                    # If Purnima (15) is within next 7 days
-                    days_to_purnima = 15 - curr_tithi_norm
-                    if 0 <= days_to_purnima < 7:
-                        matched = True
+                    # If the full moon falls within the next 7 days
+                    if next_purnima: matched = True
 
         if matched:
             desc = f"Deity: {r.deity}\nFood: {r.food}\nRules: {loc.display_name} Calendar"
@@ -595,31 +1136,42 @@ def check_special_vratams_timed(d, sunrise, sunset, tithi_changes, tithi_vals) -
 
 # ------------------------ Render ------------------------
 
-def daily_panchangam(loc, d, s_data, l_data, sr, ss, mr, nsr, t_ch, t_v, n_ch, n_v, ny_dates, earth, sun, moon, ts):
+def daily_panchangam(loc, d, s_data, l_data, sr, ss, mr, nsr, tables: Dict[str, Transitions], ny_dates, at_sr: Dict[str, Any],
+                     riseset: RiseSetTable):
     tz = pytz.timezone(loc.tz)
     sr_utc = sr.astimezone(UTC)
     nsr_utc = nsr.astimezone(UTC)
-    t_sr = ts.from_datetime(sr_utc)
     lang = loc.lang
-
-    t_now = value_at(sr_utc, t_ch, t_v)
-    t_trans = [(t.astimezone(tz), tithi_name(v, lang)) for t,v in transitions_between(sr_utc, nsr_utc, t_ch, t_v)]
-    t_str = describe_trans(tithi_name(t_now, lang), t_trans, "thereafter")
+    t_ch, t_v = tables["tithi"]
+    n_ch, n_v = tables["nakshatra"]
+
+    def day_str(name, label, connector="thereafter"):
+        # Value at sunrise plus every change before the next sunrise, straight from the table
+        now = value_at(sr_utc, *tables[name])
+        trans = [(t.astimezone(tz), label(v)) for t, v in transitions_between(sr_utc, nsr_utc, *tables[name])]
+        return now, describe_trans(label(now), trans, connector)
+
+    t_now, t_str = day_str("tithi", lambda v: tithi_name(v, lang))
+    y_str = day_str("yoga", lambda v: yoga_name(v, lang))[1]
+    k_str = day_str("karana", karana_name)[1]
     
     n_now = value_at(sr_utc, n_ch, n_v)
-    curr_pada = calculate_pada(t_sr, earth, moon)
-    curr_nak_str = f"{nak_name(n_now, lang)} ({curr_pada} {get_label('Pada', lang)})"
     n_trans = [(t.astimezone(tz), nak_name(v, lang)) for t,v in transitions_between(sr_utc, nsr_utc, n_ch, n_v)]
+    pada_str = lambda v: f"{(v - 1) % 4 + 1} {get_label('Pada', lang)}"
+    p_now = value_at(sr_utc, *tables["pada"])
+    p_trans = pada_changes(sr_utc, nsr_utc, n_now, tables["pada"])
+    padas = [pada_str(p_now)] + [pada_str(v) for _, v in p_trans]
+    pada_desc = ", ".join(f"{p} upto {fmt_time(t.astimezone(tz))}" for p, (t, _) in zip(padas, p_trans))
+    curr_nak_str = f"{nak_name(n_now, lang)} ({pada_desc + ', ' if pada_desc else ''}{padas[-1]})"
     n_str = describe_trans(curr_nak_str, n_trans, "and then")
     
-    yog = int(yoga_idx(t_sr, earth, sun, moon))
-    kar = int(karana_num(t_sr, earth, sun, moon))
-    mr_rasi = int(moon_rasi_idx(t_sr, earth, moon))
+    mr_rasi = int(at_sr["moon_rasi"])
     rahu, yama, guli = rahu_yama_gulika(d, sr, ss)
     yr_name = samvatsara_for_date(d, ny_dates)
     wk_name = weekday_name(d, lang)
     
-    festivals = check_rich_festivals(loc, d, s_data, l_data, t_now, n_now)
+    purnimas = full_moons(tables["syzygy"], sr_utc, sr_utc + timedelta(days=7))
+    festivals = check_rich_festivals(loc, d, s_data, l_data, t_now, n_now, purnimas[0] if purnimas else None)
     vratam_events = check_special_vratams_timed(d, sr, ss, t_ch, t_v)
     
     # Combine names for ASCII table
@@ -635,15 +1187,15 @@ def daily_panchangam(loc, d, s_data, l_data, sr, ss, mr, nsr, t_ch, t_v, n_ch, n
         rows.append(("Header", header))
         if event_str: rows.append(("🎉 SPECIAL", event_str))
         rows.append((get_label("Year", lang), f"{yr_name} {get_label('Year', lang)}"))
-        rows.append((get_label("Ayanam", lang), ayanam_name(t_sr, earth, sun, lang)))
+        rows.append((get_label("Ayanam", lang), ayanam_name(at_sr["sun_lon"], lang)))
         rows.append((get_label("Ruthu", lang), get_ritu(midx, True, lang)))
         rows.append((get_label("Month", lang), f"{mname} ({rasi})"))
         rows.append((get_label("Paksham", lang), paksha(t_now, lang)))
         rows.append((get_label("Tithi", lang), t_str))
         rows.append((get_label("Day", lang), wk_name))
         rows.append((get_label("Nakshatra", lang), n_str))
-        rows.append((get_label("Yoga", lang), yoga_name(yog, lang)))
-        rows.append((get_label("Karana", lang), karana_name(kar)))
+        rows.append((get_label("Yoga", lang), y_str))
+        rows.append((get_label("Karana", lang), k_str))
         rows.append((get_label("YogaQuality", lang), amirtha_siddha_marana(d.weekday(), int(n_now), lang)))
         rows.append((get_label("Rahu", lang), rahu))
         rows.append((get_label("Yama", lang), yama))
@@ -659,15 +1211,15 @@ def daily_panchangam(loc, d, s_data, l_data, sr, ss, mr, nsr, t_ch, t_v, n_ch, n
         rows.append(("Header", header))
         if event_str: rows.append(("🎉 SPECIAL", event_str))
         rows.append((get_label("Year", lang), f"{yr_name} {get_label('Year', lang)}"))
-        rows.append((get_label("Ayanam", lang), ayanam_name(t_sr, earth, sun, lang)))
+        rows.append((get_label("Ayanam", lang), ayanam_name(at_sr["sun_lon"], lang)))
         rows.append((get_label("Ruthu", lang), get_ritu(midx, False, lang)))
         rows.append((get_label("Month", lang), mname))
         rows.append((get_label("Paksham", lang), pk))
         rows.append((get_label("Tithi", lang), t_str))
         rows.append((get_label("Day", lang), wk_name))
         rows.append((get_label("Nakshatra", lang), n_str))
-        rows.append((get_label("Yoga", lang), yoga_name(yog, lang)))
-        rows.append((get_label("Karana", lang), karana_name(kar)))
+        rows.append((get_label("Yoga", lang), y_str))
+        rows.append((get_label("Karana", lang), k_str))
         rows.append((get_label("Rahu", lang), rahu))
         rows.append((get_label("Yama", lang), yama))
         rows.append((get_label("Durmuhurtham", lang), durmuhurtham(d, sr, ss)))
@@ -676,122 +1228,294 @@ def daily_panchangam(loc, d, s_data, l_data, sr, ss, mr, nsr, t_ch, t_v, n_ch, n
     rows.append((get_label("Sunrise", lang), fmt_time(sr)))
     rows.append((get_label("Sunset", lang), fmt_time(ss)))
     rows.append((get_label("Moonrise", lang), fmt_time(mr) if mr else "N/A"))
+    bm, ar = riseset.brahma_muhurtham(d), riseset.arunodaya(d)
+    rows.append((get_label("BrahmaMuhurtham", lang), fmt_interval(*bm) if bm else "N/A"))
+    rows.append((get_label("Arunodayam", lang), fmt_interval(*ar) if ar else "N/A"))
+    rows.append((get_label("Twilight", lang), twilight_str(riseset, d)))
     rows.append((get_label("Chandrashtamam", lang), chandhirashtamam_target(mr_rasi, lang)))
     rows.append((get_label("Sradhdha", lang), sradhdha_tithi_aparahna(sr, ss, t_ch, t_v, lang)))
+    # Every AYANAMSA_SET ayanamsa's nakshatra, for readers who follow another school
+    for n in AYANAMSA_SET:
+        rows.append((f"{get_label('Nakshatra', lang)} ({n})", day_str(f"nakshatra@{n}", lambda v: nak_name(v, lang), "and then")[1]))
     rows.append((get_label("Location", lang), loc.display_name))
     
     return ascii_table(rows), header, festivals, vratam_events
 
 # ------------------------ Calculation & I/O ------------------------
 
-def sun_events_range(ts, planets, loc, start_d, end_d):
+RISESET_ENGINE = os.environ.get("RISESET_ENGINE", "hour_angle")  # or "search": almanac.dark_twilight_day + find_discrete
+# almanac.dark_twilight_day's thresholds; "sun" is sunrise/sunset (refraction plus the sun's semidiameter)
+SUN_HORIZONS = {"sun": -0.8333, "civil": -6.0, "nautical": -12.0, "astronomical": -18.0}
+TWILIGHTS = ("civil", "nautical", "astronomical")
+RISESET_MAX_STEPS = int(os.environ.get("RISESET_MAX_STEPS", "8"))
+RISESET_TOL_DAYS = 0.01 / 86400.0
+
+def sun_events(ts, planets, loc, t0_utc, t1_utc) -> Dict[str, Transitions]:
+    # Rising (1) and setting (0) of the sun through every SUN_HORIZONS altitude
+    planets = opened(planets)
+    if RISESET_ENGINE == "hour_angle" or planets is None: return sun_events_hour_angle(ts, planets, [loc], t0_utc, t1_utc)[0]
+    return sun_events_search(ts, planets, loc, t0_utc, t1_utc)
+
+def sun_events_search(ts, planets, loc, t0_utc, t1_utc) -> Dict[str, Transitions]:
+    f = almanac.dark_twilight_day(planets, wgs84.latlon(loc.lat, loc.lon))
+    times, states = find_discrete(ts.from_datetime(t0_utc), ts.from_datetime(t1_utc), f)
+    out = {name: ([], []) for name in SUN_HORIZONS}
+    levels = sorted(SUN_HORIZONS, key=SUN_HORIZONS.get)
+    prev = int(f(ts.from_datetime(t0_utc)))
+    # State k means the sun is above the k lowest thresholds; a jump crosses every level in between
+    for t, st in zip(datetimes_from_times(times), states):
+        st = int(st)
+        for level in range(min(prev, st), max(prev, st)):
+            name = levels[level]
+            out[name][0].append(t)
+            out[name][1].append(1 if st > prev else 0)
+        prev = st
+    return out
+
+def sun_altitude_deg(topos_at, sun, t):
+    # Exactly the quantity almanac.dark_twilight_day thresholds
+    x = perf_counter()
+    t._nutation_angles_radians = iau2000b_radians(t)
+    alt = topos_at(t).observe(sun).apparent().altaz()[0].degrees
+    perf_count("sun altitude", np.size(alt), perf_counter() - x)
+    return alt
+
+SUN_PARALLAX_DEG = 8.794 / 3600.0
+
+def analytic_sun_radec(t):
+    # Apparent RA (degrees) and declination (radians) of date from the VSOP87 longitude
+    T = (np.asarray(t.tt) - J2000_TT) / 36525.0
+    dpsi, deps = iau2000b_radians(t)
+    lon = np.radians(analytic_sun_lon(t.tt) + precession_in_lon_deg(T)) + dpsi
+    eps = np.radians(23.4392911 - 0.0130042 * T) + deps
+    ra = np.degrees(np.arctan2(np.sin(lon) * np.cos(eps), np.cos(lon)))
+    return ra, np.arcsin(np.sin(eps) * np.sin(lon))
+
+def analytic_sun_altitude_deg(lat, lon, t):
+    # Geocentric altitude from the analytic sun, less the solar parallax
+    ra, dec = analytic_sun_radec(t)
+    phi = np.radians(lat)
+    h = np.radians(t.gast * 15.0 + lon - ra)
+    alt = np.degrees(np.arcsin(np.sin(phi) * np.sin(dec) + np.cos(phi) * np.cos(dec) * np.cos(h)))
+    return alt - SUN_PARALLAX_DEG * np.cos(np.radians(alt))
+
+def sun_events_hour_angle(ts, planets, locs, t0_utc, t1_utc) -> List[Dict[str, Transitions]]:
+    """
+    Sun rise/set through every SUN_HORIZONS altitude for several locations at once.  One geocentric
+    sun position per day and place gives the transit and the closed-form hour angle of each
+    altitude; every guess is then polished by Newton steps on the true topocentric altitude, which
+    lands within find_discrete's own millisecond tolerance.  Days on which the sun does not cross
+    an altitude, or only grazes it, have no event for it.  Without a kernel (planets None) both
+    steps use the analytic sun instead, ~0.1 s off at sunrise.
+    """
+    tt0, tt1 = ts.from_datetime(t0_utc).tt, ts.from_datetime(t1_utc).tt
+    lat = np.radians([l.lat for l in locs])[:, None]
+    lon = np.array([l.lon for l in locs])[:, None]
+    days = np.arange(np.floor(tt0) - 1.0, np.ceil(tt1) + 2.0)[None, :]
+    noon = days - lon / 360.0                      # local mean noon, near enough for a first guess
+    t = ts.tt_jd(noon.ravel())
+    if planets is None:
+        ra, dec = analytic_sun_radec(t)
+    else:
+        earth, sun = planets["earth"], planets["sun"]
+        ra, dec, _ = earth.at(t).observe(sun).apparent().radec(epoch="date")
+        ra, dec = ra._degrees, dec.radians
+    ra, dec = ra.reshape(noon.shape), dec.reshape(noon.shape)
+    transit = noon - wrap180(t.gast.reshape(noon.shape) * 15.0 + lon - ra) / 360.0
+    guesses = []
+    for k, alt in enumerate(SUN_HORIZONS.values()):
+        h0 = np.radians(alt)
+        cos_h = (np.sin(h0) - np.sin(lat) * np.sin(dec)) / (np.cos(lat) * np.cos(dec))
+        ha = np.arccos(np.clip(cos_h, -1.0, 1.0))
+        # Altitude rate at the crossing, degrees per day
+        rate = np.cos(lat) * np.cos(dec) * np.sin(ha) / np.cos(h0) * 360.0
+        guesses.append((k, alt, np.abs(cos_h) < 1.0, transit - ha / (2.0 * np.pi), transit + ha / (2.0 * np.pi), rate))
+    out = []
+    for i, loc in enumerate(locs):
+        if planets is None: altitude = functools.partial(analytic_sun_altitude_deg, loc.lat, loc.lon)
+        else: altitude = functools.partial(sun_altitude_deg, (earth + wgs84.latlon(loc.lat, loc.lon)).at, sun)
+        tt, slope, target, level, states = [], [], [], [], []
+        for k, alt, ok, rise, set_, rate in guesses:
+            m = ok[i]
+            n = int(m.sum())
+            tt += [rise[i][m], set_[i][m]]
+            slope += [rate[i][m], -rate[i][m]]
+            target.append(np.full(2 * n, alt))
+            level.append(np.full(2 * n, k))
+            states += [np.ones(n, dtype=int), np.zeros(n, dtype=int)]
+        tt, slope, target, level, states = (np.concatenate(x) for x in (tt, slope, target, level, states))
+        # Newton on the hour-angle rate first, then secant steps on whatever has not settled;
+        # crossings the sun only grazes converge slowly or never and are dropped
+        step, last = np.full(tt.shape, np.inf), None
+        active = np.ones(tt.shape, dtype=bool)
+        for _ in range(RISESET_MAX_STEPS):
+            if not active.any(): break
+            err = altitude(ts.tt_jd(tt[active])) - target[active]
+            if last is not None:
+                lt, le = last
+                moved = (tt[active] != lt) & (err != le)
+                slope[np.flatnonzero(active)[moved]] = ((err - le) / (tt[active] - lt))[moved]
+            last = (tt[active], err)
+            step[active] = err / slope[active]
+            tt[active] -= step[active]
+            still = np.abs(step[active]) >= RISESET_TOL_DAYS
+            last = (last[0][still], last[1][still])
+            active[np.flatnonzero(active)[~still]] = False
+        keep = (tt >= tt0) & (tt <= tt1) & ~active
+        res = {}
+        for k, name in enumerate(SUN_HORIZONS):
+            m = keep & (level == k)
+            order = np.argsort(tt[m])
+            res[name] = (datetimes_from_times(ts.tt_jd(tt[m][order])), states[m][order].tolist())
+        out.append(res)
+    return out
+
+def sun_events_range(ts, planets, loc, start_d, end_d, cache=None):
+    """
+    Sunrise and sunset by local civil date, plus the dawn and dusk of every twilight in TWILIGHTS:
+    the last rise through that altitude before each sunrise and the first set after each sunset,
+    absent when the sun never gets that low.
+    """
     tz = pytz.timezone(loc.tz)
-    location = wgs84.latlon(loc.lat, loc.lon)
     t0 = tz.localize(datetime.combine(start_d-timedelta(days=2), time(0,0))).astimezone(UTC)
     t1 = tz.localize(datetime.combine(end_d+timedelta(days=2), time(0,0))).astimezone(UTC)
-    f = almanac.sunrise_sunset(planets, location)
-    times, states = almanac.find_discrete(ts.from_datetime(t0), ts.from_datetime(t1), f)
+    if cache is None:
+        events = sun_events(ts, planets, loc, t0, t1)
+    else:
+        group = f"riseset_{loc.lat:.5f}_{loc.lon:.5f}"
+        events = cached_transitions(cache, group, t0, t1, lambda a, b: sun_events(ts, planets, loc, a, b))
     sunr, suns = {}, {}
-    for t, st in zip(times, states):
-        dt = sf_to_utc_dt(t).astimezone(tz)
+    for t, st in zip(*events["sun"]):
+        dt = t.astimezone(tz)
         if int(st) == 1: sunr[dt.date()] = dt
         else: suns[dt.date()] = dt
-    return sunr, suns
-
-def sunrise_sunset_for_local_date(ts, planets, loc, d):
-    tz = pytz.timezone(loc.tz)
-    location = wgs84.latlon(loc.lat, loc.lon)
-    start_local = tz.localize(datetime.combine(d, time(0, 0)))
-    t0 = (start_local - timedelta(hours=6)).astimezone(UTC)
-    t1 = (start_local + timedelta(days=1, hours=6)).astimezone(UTC)
-    f = almanac.sunrise_sunset(planets, location)
-    times, states = almanac.find_discrete(ts.from_datetime(t0), ts.from_datetime(t1), f)
-    sunrise, sunset = None, None
-    for t, st in zip(times, states):
-        dt_loc = sf_to_utc_dt(t).astimezone(tz)
-        if dt_loc.date() != d: continue
-        if int(st) == 1: sunrise = dt_loc
-        else: sunset = dt_loc
-    return sunrise, sunset
+    twilight = {}
+    for name in TWILIGHTS:
+        rises = [t for t, st in zip(*events[name]) if int(st) == 1]
+        sets = [t for t, st in zip(*events[name]) if int(st) == 0]
+        dawn, dusk = {}, {}
+        for x, sr in sunr.items():
+            i = bisect_right(rises, sr) - 1
+            if i >= 0 and sr - rises[i] < timedelta(hours=12): dawn[x] = rises[i].astimezone(tz)
+        for x, ss in suns.items():
+            i = bisect_left(sets, ss)
+            if i < len(sets) and sets[i] - ss < timedelta(hours=12): dusk[x] = sets[i].astimezone(tz)
+        twilight[name] = (dawn, dusk)
+    return sunr, suns, twilight
+
+RISESET_BLOCK_DAYS = int(os.environ.get("RISESET_BLOCK_DAYS", "32"))
 
-def wrap180(x): return ((x + 180.0) % 360.0) - 180.0
-def sun_sidereal_lon_deg(sf_t, earth, sun):
-    e = earth.at(sf_t)
-    _, slon, _ = e.observe(sun).apparent().ecliptic_latlon()
-    return float(sidereal_lon(slon.degrees, sf_t))
-
-def mesha_sankranti_utc(year, ts, earth, sun):
-    t0 = UTC.localize(datetime(year, 4, 10))
-    t1 = UTC.localize(datetime(year, 4, 18))
-    step = timedelta(hours=2)
-    prev_dt, cur = t0, t0 + step
-    bracket = None
-    while cur <= t1:
-        prev_f = wrap180(sun_sidereal_lon_deg(ts.from_datetime(prev_dt), earth, sun))
-        cur_f = wrap180(sun_sidereal_lon_deg(ts.from_datetime(cur), earth, sun))
-        if prev_f < 0.0 and cur_f > 0.0:
-            bracket = (prev_dt, cur)
-            break
-        prev_dt = cur
-        cur += step
-    if not bracket: return t0
-    lo, hi = bracket
-    for _ in range(50):
-        mid = lo + (hi - lo)/2
-        if wrap180(sun_sidereal_lon_deg(ts.from_datetime(mid), earth, sun)) > 0: hi = mid
-        else: lo = mid
-    return lo
-
-def puthandu_civil_date(year, ts, planets, earth, sun, loc):
-    tz = pytz.timezone(loc.tz)
-    ingress = mesha_sankranti_utc(year, ts, earth, sun).astimezone(tz)
+@dataclass
+class RiseSetTable:
+    # Sunrise/sunset and twilights by local civil date for one location; a date outside it pulls in a block around it
+    ts: Timescale
+    planets: Any
+    loc: LocationConfig
+    sunr: Dict[date, datetime] = field(default_factory=dict)
+    suns: Dict[date, datetime] = field(default_factory=dict)
+    dawn: Dict[str, Dict[date, datetime]] = field(default_factory=lambda: {n: {} for n in TWILIGHTS})
+    dusk: Dict[str, Dict[date, datetime]] = field(default_factory=lambda: {n: {} for n in TWILIGHTS})
+    covered: Set[date] = field(default_factory=set)
+
+    def fill(self, start_d, end_d, cache=None):
+        sunr, suns, twilight = sun_events_range(self.ts, self.planets, self.loc, start_d, end_d, cache)
+        self.sunr.update(sunr)
+        self.suns.update(suns)
+        for name, (dawn, dusk) in twilight.items():
+            self.dawn[name].update(dawn)
+            self.dusk[name].update(dusk)
+        # sun_events_range searches two days either side, so start_d-1 .. end_d+1 are complete
+        self.covered.update(start_d + timedelta(days=i) for i in range(-1, (end_d - start_d).days + 2))
+        return self
+
+    def __call__(self, d) -> Tuple[Optional[datetime], Optional[datetime]]:
+        if d not in self.covered:
+            half = timedelta(days=RISESET_BLOCK_DAYS // 2)
+            self.fill(d - half, d + half)
+        return self.sunr.get(d), self.suns.get(d)
+
+    def twilight(self, name, d) -> Tuple[Optional[datetime], Optional[datetime]]:
+        self(d)
+        return self.dawn[name].get(d), self.dusk[name].get(d)
+
+    def night_muhurtham(self, d) -> Optional[timedelta]:
+        # A fifteenth of the night that ends at sunrise on d
+        (_, ss), (sr, _) = self(d - timedelta(days=1)), self(d)
+        return (sr - ss) / 15 if sr and ss else None
+
+    def brahma_muhurtham(self, d) -> Optional[Tuple[datetime, datetime]]:
+        # The last-but-one muhurtham of the night
+        m = self.night_muhurtham(d)
+        return (self.sunr[d] - 2 * m, self.sunr[d] - m) if m else None
+
+    def arunodaya(self, d) -> Optional[Tuple[datetime, datetime]]:
+        # Four ghatikas (two muhurthams) before sunrise
+        m = self.night_muhurtham(d)
+        return (self.sunr[d] - 2 * m, self.sunr[d]) if m else None
+
+Sankrantis = Dict[int, Dict[int, datetime]]   # year -> rasi -> ingress instant (UTC)
+
+def sankranti_index(solar: Transitions) -> Sankrantis:
+    # All twelve ingresses of every year the solar rasi table covers
+    out: Sankrantis = {}
+    for t, r in zip(*solar): out.setdefault(t.year, {})[r] = t
+    return out
+
+def sankranti_civil_date(riseset: RiseSetTable, ingress_utc) -> date:
+    # An ingress after sunset belongs to the next civil day
+    ingress = ingress_utc.astimezone(pytz.timezone(riseset.loc.tz))
     d = ingress.date()
-    sr, ss = sunrise_sunset_for_local_date(ts, planets, loc, d)
-    if sr and ss and ingress > ss: return d + timedelta(days=1)
+    _, ss = riseset(d)
+    if ss and ingress > ss: return d + timedelta(days=1)
     return d
 
-def ugadi_civil_date(year, ts, planets, earth, sun, moon, loc):
+def puthandu_civil_date(year, riseset: RiseSetTable, sankrantis: Sankrantis) -> Optional[date]:
+    ingress = sankrantis.get(year, {}).get(0)  # Mesha
+    return sankranti_civil_date(riseset, ingress) if ingress else None
+
+def new_moons(syzygy: Transitions, a_utc, b_utc) -> List[datetime]:
+    return [t for t, v in transitions_between(a_utc, b_utc, *syzygy) if v == 0]
+
+def full_moons(syzygy: Transitions, a_utc, b_utc) -> List[datetime]:
+    return [t for t, v in transitions_between(a_utc, b_utc, *syzygy) if v == 1]
+
+def ugadi_civil_date(year, riseset: RiseSetTable, tithi: Transitions, syzygy: Transitions, solar: Transitions) -> Optional[date]:
     t_start = UTC.localize(datetime(year, 3, 10))
     t_end = UTC.localize(datetime(year, 4, 20))
-    f = almanac.moon_phases(planets)
-    times, phases = find_discrete(ts.from_datetime(t_start), ts.from_datetime(t_end), f)
-    for t, phase in zip(times, phases):
-        if phase == 0:
-            s_lon = sun_sidereal_lon_deg(t, earth, sun)
-            if 320 <= s_lon < 360:
-                check_dt = sf_to_utc_dt(t).astimezone(pytz.timezone(loc.tz)).date()
-                for d_off in range(3):
-                    d_candidate = check_dt + timedelta(days=d_off)
-                    sr, _ = sunrise_sunset_for_local_date(ts, planets, loc, d_candidate)
-                    if sr:
-                        tid = tithi_idx(ts.from_datetime(sr.astimezone(UTC)), earth, sun, moon)
-                        if tid == 1: return d_candidate
-    return date(year, 4, 1)
+    changes, values = tithi
+    # Outside the table the year's Ugadi lies beyond the rendered days either way
+    if not changes or t_start < changes[0] or changes[-1] < t_end: return None
+    for nm in new_moons(syzygy, t_start, t_end):
+        # Chaitra is the month whose new moon finds the sun in Meena
+        if value_at(nm, *solar) == 11:
+            check_dt = nm.astimezone(pytz.timezone(riseset.loc.tz)).date()
+            for d_off in range(3):
+                d_candidate = check_dt + timedelta(days=d_off)
+                sr, _ = riseset(d_candidate)
+                if sr and value_at(sr.astimezone(UTC), changes, values) == 1: return d_candidate
+            # Kshaya pratipada, seen by no sunrise: the day whose sunrise-to-sunrise span holds its start
+            start = next((t for t, v in transitions_between(nm - timedelta(hours=1), t_end, changes, values) if v == 1), None)
+            for d_off in range(-1, 2):
+                d_candidate = check_dt + timedelta(days=d_off)
+                (sr, _), (nsr, _) = riseset(d_candidate), riseset(d_candidate + timedelta(days=1))
+                if start and sr and nsr and sr <= start < nsr: return d_candidate
+            return None
+    return None
 
 def samvatsara_for_date(d: date, new_year_dates: Dict[int, date]) -> str:
     y = d.year
-    ny = new_year_dates.get(y)
+    ny = new_year_dates.get(y)  # None when that year's new year falls outside the tables
     sy = y if ny and d >= ny else (y - 1)
     return SAMVATSARA_NAMES[(sy - BASE_SAMVATSARA_YEAR) % 60]
 
-def month_day_numbers_solar(earth, sun, ts, planets, loc, start_d, end_d, lang):
+def month_day_numbers_solar(earth, sun, ts, riseset: RiseSetTable, start_d, end_d, lang, sankrantis: Sankrantis):
     back_days = 45
-    t0 = UTC.localize(datetime.combine(start_d - timedelta(days=back_days), time(0,0)))
-    t1 = UTC.localize(datetime.combine(end_d + timedelta(days=15), time(0,0)))
-    
-    def f_rasi(t): return solar_rasi_idx(t, earth, sun)
-    f_rasi.step_days = DISCRETE_STEP_DAYS
-    
-    ingress_times, rasi_values = precompute_discrete(ts, t0, t1, f_rasi)
     month_starts = {} 
     
-    for t_ing, r_val in zip(ingress_times, rasi_values):
-        tz = pytz.timezone(loc.tz)
-        dt_local = t_ing.astimezone(tz)
-        d_civil = dt_local.date()
-        sr, ss = sunrise_sunset_for_local_date(ts, planets, loc, d_civil)
-        if ss and dt_local < ss: month_starts[d_civil] = r_val
-        else: month_starts[d_civil + timedelta(days=1)] = r_val
+    for year in range(start_d.year - 1, end_d.year + 1):
+        for r_val, t_ing in sankrantis.get(year, {}).items():
+            if start_d - timedelta(days=back_days) <= t_ing.date() <= end_d + timedelta(days=1):
+                month_starts[sankranti_civil_date(riseset, t_ing)] = r_val
 
     current_mi = -1
     last_start_date = start_d - timedelta(days=back_days)
@@ -821,88 +1545,90 @@ def month_day_numbers_solar(earth, sun, ts, planets, loc, start_d, end_d, lang):
         day_count += 1
     return res
 
-def get_lunar_month_map(earth, sun, moon, ts, planets, loc, start_d, end_d, lang):
-    # Search range for lunar months
-    back_days = 60
-    t0 = UTC.localize(datetime.combine(start_d - timedelta(days=back_days), time(0,0)))
-    t1 = UTC.localize(datetime.combine(end_d + timedelta(days=30), time(0,0)))
-    
-    # 1. Find all Tithi 1 Starts (New Moon Ends)
-    def f_tithi(t): return tithi_idx(t, earth, sun, moon)
-    f_tithi.step_days = DISCRETE_STEP_DAYS
-    changes, values = precompute_discrete(ts, t0, t1, f_tithi)
-    
-    # Store (timestamp, new_month_index)
-    month_transitions = []
-    
-    for i, t in enumerate(changes):
-        if values[i] == 1: # Tithi became 1 (Prathama)
-            # Determine Month Name based on Solar Rasi at this moment + 1
-            # FIX: t is already datetime, so use it directly
-            s_idx = solar_rasi_idx(ts.from_datetime(t), earth, sun)
-            lunar_month_idx = (s_idx + 1) % 12
-            month_transitions.append((t, lunar_month_idx))
-    
-    month_transitions.sort(key=lambda x: x[0])
+def get_lunar_month_map(riseset: RiseSetTable, start_d, end_d, lang, syzygy: Transitions, solar: Transitions):
+    # 1. Every new moon starts a month named after the solar rasi + 1
+    a = UTC.localize(datetime.combine(start_d, time(0, 0))) - timedelta(days=HORIZON_BACK_DAYS)
+    nm_times = new_moons(syzygy, a, UTC.localize(datetime.combine(end_d, time(0, 0))) + timedelta(days=2))
+    nm_months = [(value_at(t, *solar) + 1) % 12 for t in nm_times]
     
     res = {}
     d = start_d
-    tz = pytz.timezone(loc.tz)
-    
-    # Pre-calculate state for the first day
-    # Find the latest transition that happened BEFORE the sunrise of start_d
-    first_sr, _ = sunrise_sunset_for_local_date(ts, planets, loc, start_d)
     
     # Fallback if no transition found (rare)
     cur_mi = 0 
     
     while d <= end_d:
-        sr, _ = sunrise_sunset_for_local_date(ts, planets, loc, d)
+        sr, _ = riseset(d)
         
         # If we have sunrise, check which month applies
         if sr:
-            # Find the latest transition strictly before sunrise
-            best_idx = -1
-            for i, (t_trans, m_idx) in enumerate(month_transitions):
-                # FIX: t_trans is already datetime (UTC aware)
-                if t_trans < sr.astimezone(UTC):
-                    best_idx = i
-                else:
-                    break
-            
+            # Latest new moon strictly before sunrise
+            best_idx = bisect_left(nm_times, sr.astimezone(UTC)) - 1
             if best_idx != -1:
-                cur_mi = month_transitions[best_idx][1]
+                cur_mi = nm_months[best_idx]
         
         res[d] = (lunar_month_name(cur_mi, lang), cur_mi)
         d += timedelta(days=1)
         
     return res
 
-def build_calendar(loc, ts, planets, earth, sun, moon, t_ch, t_v, n_ch, n_v):
-    tz = pytz.timezone(loc.tz)
-    start_d = datetime.now(tz).date()
+PlaceKey = Tuple[float, float, str, Optional[Tuple[float, float]]]  # lat, lon, tz, observer_key
+
+@dataclass
+class PlaceAstronomy:
+    # Everything a calendar needs that depends only on where it is; every language at the place shares it
+    start_d: date
+    end_d: date
+    riseset: RiseSetTable
+    moonr: Dict[date, datetime]
+    at_sr: Dict[date, Dict[str, Any]]
+    new_year: Dict[str, Dict[int, Optional[date]]] = field(default_factory=dict)  # style -> year -> date
+
+def place_key(loc, okey) -> PlaceKey:
+    # Rise/set uses skyfield's fixed refraction and semidiameter horizon, so there is no horizon to key on
+    return (loc.lat, loc.lon, loc.tz, okey)
+
+def place_astronomy(ts, planets, earth, sun, moon, loc, cache=None) -> PlaceAstronomy:
+    start_d = datetime.now(pytz.timezone(loc.tz)).date()
     end_d = start_d + timedelta(days=DAYS_AHEAD)
-    
-    years = range(start_d.year-1, end_d.year+2)
-    ny_dates = {}
-    for y in years:
-        if loc.style == "TAMIL": ny_dates[y] = puthandu_civil_date(y, ts, planets, earth, sun, loc)
-        else: ny_dates[y] = ugadi_civil_date(y, ts, planets, earth, sun, moon, loc)
-        
-    sunr, suns = sun_events_range(ts, planets, loc, start_d, end_d)
+    perf_caller("sun events", loc.key)
+    riseset = RiseSetTable(ts, planets, loc).fill(start_d, end_d, cache)
+    sr_days = sorted(riseset.sunr)
+    sr_q = sunrise_quantities(times_from_datetimes(ts, [riseset.sunr[x] for x in sr_days]), earth, sun, moon)
+    at_sr = {x: {k: v[i] for k, v in sr_q.items()} for i, x in enumerate(sr_days)}
+    perf_caller("moon events", loc.key)
+    moonr, _ = moon_events_range(ts, planets, loc, start_d, end_d, cache)
+    return PlaceAstronomy(start_d, end_d, riseset, moonr, at_sr)
+
+def build_calendar(loc, ts, earth, sun, tables: Dict[str, Transitions], sankrantis: Sankrantis,
+                   transits: Dict[str, Transitions], place: PlaceAstronomy):
+    tz = pytz.timezone(loc.tz)
+    start_d, end_d = place.start_d, place.end_d
+    riseset = place.riseset
+    sunr, suns = riseset.sunr, riseset.suns
+
+    ny_dates = place.new_year.get(loc.style)
+    if ny_dates is None:
+        perf_caller("new year", loc.key)
+        ny_dates = place.new_year[loc.style] = {}
+        for y in range(start_d.year-1, end_d.year+2):
+            if loc.style == "TAMIL": ny_dates[y] = puthandu_civil_date(y, riseset, sankrantis)
+            else: ny_dates[y] = ugadi_civil_date(y, riseset, tables["tithi"], tables["syzygy"], tables["solar_rasi"])
     
     s_info = {}
     l_info = {}
     if loc.style == "TAMIL": 
-        s_info = month_day_numbers_solar(earth, sun, ts, planets, loc, start_d, end_d, loc.lang)
+        perf_caller("solar map", loc.key)
+        s_info = month_day_numbers_solar(earth, sun, ts, riseset, start_d, end_d, loc.lang, sankrantis)
     else: 
-        # UPDATED: Pass planets/loc to new lunar logic
-        l_info = get_lunar_month_map(earth, sun, moon, ts, planets, loc, start_d, end_d, loc.lang)
+        perf_caller("lunar map", loc.key)
+        l_info = get_lunar_month_map(riseset, start_d, end_d, loc.lang, tables["syzygy"], tables["solar_rasi"])
         
     cal = Calendar()
     
     seen_uids: Set[str] = set()
 
+    perf_caller("daily render", loc.key)
     d = start_d
     while d < end_d:
         sr = sunr.get(d)
@@ -910,10 +1636,10 @@ def build_calendar(loc, ts, planets, earth, sun, moon, t_ch, t_v, n_ch, n_v):
         nsr = sunr.get(d+timedelta(days=1))
         
         if sr and ss and nsr:
-            mr = calculate_moonrise(d, loc, ts, planets)
+            mr = place.moonr.get(d)
             s_d = s_info.get(d)
             l_d = l_info.get(d)
-            desc, title, festivals, vratam_events = daily_panchangam(loc, d, s_d, l_d, sr, ss, mr, nsr, t_ch, t_v, n_ch, n_v, ny_dates, earth, sun, moon, ts)
+            desc, title, festivals, vratam_events = daily_panchangam(loc, d, s_d, l_d, sr, ss, mr, nsr, tables, ny_dates, place.at_sr[d], riseset)
             
             # 1. Daily Panchangam (All Day)
             uid_daily = f"{loc.key}-{d.isoformat()}@panchangam"
@@ -967,6 +1693,24 @@ def build_calendar(loc, ts, planets, earth, sun, moon, t_ch, t_v, n_ch, n_v):
                     seen_uids.add(uid_vrat)
 
         d += timedelta(days=1)
+
+    # 4. Slow-planet transits inside the rendered range
+    a, b = (tz.localize(datetime.combine(x, time(0, 0))).astimezone(UTC) for x in (start_d, end_d))
+    for body in TRANSIT_BODIES:
+        if body not in transits: continue
+        retro = dict(zip(*transits[f"{body}_retro"]))
+        for t, rasi in transitions_between(a, b, *transits[body]):
+            local = t.astimezone(tz)
+            uid_tr = f"{loc.key}-{local:%Y%m%d%H%M}-{body}@transit"
+            if uid_tr in seen_uids: continue
+            te = Event()
+            te.name = transit_title(body, rasi, retro[t], loc.lang)
+            te.begin = local
+            te.categories = {"TRANSIT"}
+            te.description = f"{body} enters {rasi_name(rasi, loc.lang)} at {fmt_time(local)}, {fmt_date(local.date())}."
+            te.uid = uid_tr
+            cal.events.add(te)
+            seen_uids.add(uid_tr)
         
     if os.path.exists(MANUAL_FILE):
         try:
@@ -987,28 +1731,399 @@ def build_calendar(loc, ts, planets, earth, sun, moon, t_ch, t_v, n_ch, n_v):
         
     return cal
 
+# ------------------------ persistent cache ------------------------
+
+CACHE_VERSION = 2
+
+def file_sha256(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+    return h.hexdigest()
+
+def cache_key(ephemeris_path: Optional[str]) -> str:
+    # Anything that changes a cached instant must be part of the key; without a path, whatever
+    # kernel files a lazy open could pick
+    paths = [ephemeris_path] if ephemeris_path else [p for p in (EXCERPT_FILE, EPHEMERIS_FILE) if os.path.exists(p)]
+    return json.dumps({
+        "version": CACHE_VERSION,
+        "ephemeris": ",".join(file_sha256(p) for p in paths) or "none",
+        "ayanamsa": {n: repr(AYANAMSAS[n]) for n in (AYANAMSA,) + AYANAMSA_SET},
+        "tol_s": ROOT_TOL_SECONDS,
+        "grid_days": ROOT_GRID_DAYS,
+        "cheb": [CHEB_DEGREE, CHEB_SEGMENT_DAYS, CHEB_TOPO_SEGMENT_DAYS] if USE_CHEB_MODEL else None,
+        "tier": ACCURACY_TIER,
+        "backend": EPHEMERIS_BACKEND,
+        "riseset": [RISESET_ENGINE, RISESET_MAX_STEPS],
+        "timescale": file_sha256(TIMESCALE_FILE) if os.path.exists(TIMESCALE_FILE) else "builtin",
+    }, sort_keys=True)
+
+def load_cache(path, key) -> Dict[str, np.ndarray]:
+    if not os.path.exists(path): return {}
+    try:
+        with np.load(path) as z:
+            if str(z["key"]) != key:
+                print(f"{path}: key changed (ephemeris/ayanamsa/tolerance), ignoring it")
+                return {}
+            return {k: z[k] for k in z.files if k != "key"}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{path}: unreadable ({e}), ignoring it")
+        return {}
+
+def save_cache(path, key, cache: Dict[str, np.ndarray]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez_compressed(tmp, key=np.array(key), **cache)
+    os.replace(tmp, path)
+
+def cached_transitions(cache: Dict[str, np.ndarray], group, t0_utc, t1_utc, compute) -> Dict[str, Transitions]:
+    """
+    Returns compute(t0, t1) for a group of transition tables, reusing whatever part of [t0, t1]
+    the cache already covers and only computing the uncovered ends.  The cache entry is
+    replaced by the merged result for exactly [t0, t1].
+    """
+    a, b = t0_utc.timestamp(), t1_utc.timestamp()
+    span = cache.get(f"{group}__span")
+    if span is not None and span[0] < b and a < span[1]:
+        lo, hi = max(a, span[0]), min(b, span[1])
+        gaps = [g for g in ((a, span[0]), (span[1], b)) if g[0] < g[1]]
+    else:
+        lo = hi = None
+        gaps = [(a, b)]
+    names = [k[len(group) + 2:-3] for k in cache if k.startswith(group + "__") and k.endswith("__t")]
+    merged: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    if lo is not None:
+        for name in names:
+            t, v = cache[f"{group}__{name}__t"], cache[f"{group}__{name}__v"]
+            keep = (t >= lo) & (t <= hi)
+            merged[name] = (t[keep], v[keep])
+    for g0, g1 in gaps:
+        part = compute(datetime.fromtimestamp(g0, UTC), datetime.fromtimestamp(g1, UTC))
+        for name, (changes, values) in part.items():
+            t0, v0 = merged.get(name, (np.empty(0), np.empty(0, dtype=np.int16)))
+            merged[name] = (np.concatenate([t0, utc_seconds(changes)]),
+                            np.concatenate([v0, np.asarray(values, dtype=np.int16)]))
+    span_str = lambda x, y: f"{datetime.fromtimestamp(x, UTC):%Y-%m-%d} .. {datetime.fromtimestamp(y, UTC):%Y-%m-%d}"
+    done = ", ".join(span_str(*g) for g in gaps) or "nothing"
+    if lo is None: print(f"Transition cache [{group}]: miss, computed {done}")
+    else: print(f"Transition cache [{group}]: hit {span_str(lo, hi)}, computed {done}")
+
+    out = {}
+    cache[f"{group}__span"] = np.array([a, b])
+    for name, (t, v) in merged.items():
+        order = np.argsort(t, kind="stable")
+        t, v = t[order], v[order].astype(np.int16)
+        cache[f"{group}__{name}__t"], cache[f"{group}__{name}__v"] = t, v
+        out[name] = (datetimes_from_seconds(t), v.tolist())
+    return out
+
+# ------------------------ accuracy report ------------------------
+
+def accuracy_report(ts, earth, sun, moon, t0_utc, t1_utc):
+    # Same sweep per candidate against the exact kernel run; a transition counts as moved
+    # beyond twice the root tolerance
+    a = ANALYTIC_BODIES
+    runs = {"exact": ("exact", earth, sun, moon), "fast": ("fast", earth, sun, moon),
+            "analytic": ("exact", a["earth"], a["sun"], a["moon"])}
+    tables, secs = {}, {}
+    for name, (tier, *bodies) in runs.items():
+        set_accuracy_tier(tier)
+        x = perf_counter()
+        tables[name] = sweep_transitions(ts, t0_utc, t1_utc, *bodies)
+        secs[name] = perf_counter() - x
+    set_accuracy_tier(ACCURACY_TIER)
+    print(f"Accuracy report {t0_utc:%Y-%m-%d} .. {t1_utc:%Y-%m-%d} ("
+          + ", ".join(f"{k} {v:.2f}s" for k, v in secs.items()) + ")")
+    for cand in ("fast", "analytic"):
+        print(f"\n{cand} vs exact")
+        print(f"{'series':<12}{'count':>7}{'moved':>7}{'> 1s':>6}{'max |dt| s':>12}{'mean |dt| s':>13}{'value diff':>12}")
+        for ser in ALL_SERIES:
+            (ce, ve), (cf, vf) = tables["exact"][ser.name], tables[cand][ser.name]
+            if len(ce) != len(cf):
+                print(f"{ser.name:<12}{len(ce):>7}  count differs ({len(cf)})")
+                continue
+            dt = np.abs(utc_seconds(cf) - utc_seconds(ce)) if ce else np.zeros(1)
+            moved, over = int(np.sum(dt > 2.0 * ROOT_TOL_SECONDS)), int(np.sum(dt > 1.0))
+            print(f"{ser.name:<12}{len(ce):>7}{moved:>7}{over:>6}{dt.max():>12.3f}{dt.mean():>13.3f}{sum(a != b for a, b in zip(ve, vf)):>12}")
+
+    # Sunrise/sunset and twilights: the hour-angle engine for every place in one call against a
+    # search per place.  The search steps ~1h, so it misses the brief dips the engine resolves
+    kernel = {"earth": earth, "sun": sun}
+    locs = list({(l.lat, l.lon): l for l in LOCATIONS}.values())
+    x = perf_counter()
+    fast = sun_events_hour_angle(ts, kernel, locs, t0_utc, t1_utc)
+    secs = perf_counter() - x
+    x = perf_counter()
+    exact = [sun_events_search(ts, kernel, l, t0_utc, t1_utc) for l in locs]
+    print(f"\nhour_angle vs search sunrise/sunset ({secs:.2f}s vs {perf_counter() - x:.2f}s)")
+    print(f"{'place':<20}{'horizon':<14}{'search':>8}{'hour_angle':>12}{'max |dt| s':>12}")
+    for l, f, e in zip(locs, fast, exact):
+        for name in SUN_HORIZONS:
+            ce, cf = utc_seconds(e[name][0]), utc_seconds(f[name][0])
+            if not len(ce) or not len(cf):
+                dt = np.zeros(1)
+            else:
+                # Each search event against the nearest engine event
+                i = np.clip(np.searchsorted(cf, ce), 1, len(cf) - 1) if len(cf) > 1 else np.zeros(len(ce), dtype=int)
+                dt = np.minimum(np.abs(cf[i] - ce), np.abs(cf[i - 1] - ce)) if len(cf) > 1 else np.abs(cf[0] - ce)
+            print(f"{l.lat:.3f},{l.lon:.3f}".ljust(20) + f"{name:<14}{len(ce):>8}{len(cf):>12}{dt.max():>12.4f}")
+
+def syzygies_from_tithi(tithi: Transitions) -> Transitions:
+    # New moon starts tithi 1, full moon starts tithi 16
+    pairs = [(t, 0 if v == 1 else 1) for t, v in zip(*tithi) if v in (1, 16)]
+    return [t for t, _ in pairs], [v for _, v in pairs]
+
+def ayanamsa_report(ts, earth, sun, moon, t0_utc, t1_utc):
+    # One sweep carries every ayanamsa; each one's transitions are set against the configured one
+    others = [n for n in AYANAMSAS if n != AYANAMSA]
+    x = perf_counter()
+    tables = sweep_transitions(ts, t0_utc, t1_utc, earth, sun, moon, ALL_SERIES + ayanamsa_series(others))
+    tt = ts.from_datetime(t0_utc).tt
+    print(f"Ayanamsa report {t0_utc:%Y-%m-%d} .. {t1_utc:%Y-%m-%d} ({perf_counter() - x:.2f}s, one sweep)")
+    base = float(AYANAMSAS[AYANAMSA](tt))
+    for n in [AYANAMSA] + others:
+        v = float(AYANAMSAS[n](tt))
+        print(f"  {n:<12}{v:>11.5f}°  {(v - base) * 60.0:>+9.2f}'")
+    print(f"\n{'series':<12}{'ayanamsa':<13}{'count':>7}{'mean dt h':>11}{'max |dt| h':>12}")
+    for ser in ALL_SERIES:
+        if not ser.sidereal: continue
+        ce, ve = tables[ser.name]
+        for n in others:
+            cf, vf = tables[f"{ser.name}@{n}"]
+            # Any two ayanamsas differ by less than one width, so the same crossing is at most one index away
+            for off in (0, 1, -1):
+                pairs = [(a, b) for a, b in zip(ce[max(0, off):], cf[max(0, -off):])]
+                if all(v1 == v2 for v1, v2 in zip(ve[max(0, off):], vf[max(0, -off):])): break
+            else:
+                print(f"{ser.name:<12}{n:<13}{len(cf):>7}{'unaligned':>23}")
+                continue
+            dt = np.array([(b - a).total_seconds() for a, b in pairs]) / 3600.0 if pairs else np.zeros(1)
+            print(f"{ser.name:<12}{n:<13}{len(cf):>7}{dt.mean():>11.2f}{np.abs(dt).max():>12.2f}")
+
+# ------------------------ shipped almanac ------------------------
+# Sankrantis and syzygies do not depend on the observer, so they ship precomputed for the
+# whole DE421 span in ALMANAC_FILE (--build-almanac).  A run uses it when it was built for the
+# configured ayanamsa and covers the horizon, and otherwise derives both from its own sweep.
+
+ALMANAC_FILE = os.environ.get("ALMANAC_FILE", "almanac.npz")
+ALMANAC_VERSION = 1  # separate from CACHE_VERSION: the rise/set cache layout says nothing about longitudes
+ALMANAC_SERIES = (SOLAR_RASI, SYZYGY)
+
+def almanac_key() -> str:
+    return json.dumps({"version": ALMANAC_VERSION, "ayanamsa": repr(AYANAMSAS[AYANAMSA])}, sort_keys=True)
+
+def build_almanac(ts, start_d: date, end_d: date, dst=ALMANAC_FILE):
+    t0, t1 = (UTC.localize(datetime.combine(x, time(0, 0))) for x in (start_d, end_d))
+    planets, path = load_ephemeris(ts, t0, t1)
+    x = perf_counter()
+    cache: Dict[str, np.ndarray] = {}
+    cached_transitions(cache, "almanac", t0, t1, lambda a, b: sweep_transitions(
+        ts, a, b, planets["earth"], planets["sun"], planets["moon"], ALMANAC_SERIES))
+    save_cache(dst, almanac_key(), cache)
+    print(f"Wrote {dst} from {path} ({os.path.getsize(dst) // 1024} KiB, {start_d} .. {end_d}, {perf_counter() - x:.1f}s)")
+
+def load_almanac(t0_utc, t1_utc, path=ALMANAC_FILE) -> Optional[Dict[str, Transitions]]:
+    cache = load_cache(path, almanac_key())
+    span = cache.get("almanac__span")
+    if span is None or not (span[0] <= t0_utc.timestamp() and t1_utc.timestamp() <= span[1]): return None
+    return {ser.name: (datetimes_from_seconds(cache[f"almanac__{ser.name}__t"]), cache[f"almanac__{ser.name}__v"].tolist())
+            for ser in ALMANAC_SERIES}
+
+def with_almanac(tables: Dict[str, Transitions], t0_utc, t1_utc) -> Dict[str, Transitions]:
+    out = dict(tables)
+    alm = load_almanac(t0_utc, t1_utc)
+    if alm is None:
+        print(f"{ALMANAC_FILE} missing or not for this ayanamsa/horizon, using the sweep's sankrantis and syzygies")
+        out["syzygy"] = syzygies_from_tithi(tables["tithi"])
+    else: out.update(alm)
+    return out
+
+# ------------------------ ephemeris ------------------------
+
+def ephemeris_span(now):
+    # The yearly new-year searches reach from the year before start to the year after end
+    end = now + timedelta(days=DAYS_AHEAD+50)
+    return UTC.localize(datetime(now.year - 1, 1, 1)), UTC.localize(datetime(end.year + 2, 1, 1))
+
+def sweep_horizon(now):
+    t0 = min(now - timedelta(days=HORIZON_BACK_DAYS), UTC.localize(datetime(now.year, 1, 1)))
+    return t0, now + timedelta(days=DAYS_AHEAD+50)
+
+def build_ephemeris_excerpt(ts, start_d: date, end_d: date, src=EPHEMERIS_FILE, dst=EXCERPT_FILE):
+    jd0 = ts.utc(start_d.year, start_d.month, start_d.day).tdb
+    jd1 = ts.utc(end_d.year, end_d.month, end_d.day).tdb
+    from jplephem.spk import SPK
+    from jplephem.excerpter import write_excerpt
+    spk = SPK.open(src)
+    try:
+        summaries = [s for s, seg in zip(spk.daf.summaries(), spk.segments) if seg.target in EXCERPT_TARGETS]
+        with open(dst, "w+b") as f:
+            write_excerpt(spk, f, jd0, jd1, summaries)
+    finally:
+        spk.close()
+    print(f"Wrote {dst} ({os.path.getsize(dst) // 1024} KiB, {start_d} .. {end_d})")
+
+def build_timescale_file(dst=TIMESCALE_FILE):
+    # Skyfield's bundled IERS tables, in their own compact layout
+    arrays = load_bundled_npy("iers.npz")
+    np.savez_compressed(dst, **{k: arrays[k] for k in ("tt_jd_minus_arange", "delta_t_1e7", "leap_dates", "leap_offsets")})
+    print(f"Wrote {dst} ({os.path.getsize(dst) // 1024} KiB)")
+
+def load_timescale():
+    if not os.path.exists(TIMESCALE_FILE):
+        if OFFLINE: raise SystemExit(f"OFFLINE=1 but {TIMESCALE_FILE} is missing; run --build-timescale")
+        return load.timescale()
+    with np.load(TIMESCALE_FILE) as z:
+        daily_tt = z["tt_jd_minus_arange"] + np.arange(len(z["tt_jd_minus_arange"]))
+        daily_delta_t = (z["delta_t_1e7"] / 1e7).round(7)
+        return Timescale((daily_tt, daily_delta_t), z["leap_dates"], z["leap_offsets"])
+
+def open_kernel(path):
+    if os.path.exists(path): return SpiceKernel(path)
+    if OFFLINE: raise FileNotFoundError(f"OFFLINE=1 but {path} is missing")
+    return load(path)
+
+def load_ephemeris(ts, t0_utc, t1_utc):
+    # Prefer the small excerpt whenever it holds every body we need for the whole run
+    if os.path.exists(EXCERPT_FILE):
+        planets = open_kernel(EXCERPT_FILE)
+        jd0, jd1 = ts.from_datetime(t0_utc).tdb, ts.from_datetime(t1_utc).tdb
+        segs = planets.spk.segments
+        if {s.target for s in segs} >= set(EXCERPT_TARGETS) and all(s.start_jd <= jd0 and jd1 <= s.end_jd for s in segs):
+            return planets, EXCERPT_FILE
+        print(f"{EXCERPT_FILE} does not cover {t0_utc:%Y-%m-%d} .. {t1_utc:%Y-%m-%d}, using {EPHEMERIS_FILE}")
+        planets.close()
+    return open_kernel(EPHEMERIS_FILE), EPHEMERIS_FILE
+
+class LazyKernel:
+    # The kernel, opened the first time something indexes it; open() is None when it cannot be
+    def __init__(self, ts, t0_utc, t1_utc):
+        self.ts, self.span = ts, (t0_utc, t1_utc)
+        self.planets, self.path, self.error = None, None, None
+
+    def open(self):
+        if self.planets is None and self.error is None:
+            try: self.planets, self.path = load_ephemeris(self.ts, *self.span)
+            except OSError as e:
+                self.error = e
+                print(f"No ephemeris kernel ({e}): rise/set from the analytic sun, no moonrise or Guru/Sani transits")
+        return self.planets
+
+    def __getitem__(self, name):
+        if self.open() is None: raise KeyError(f"{name}: no ephemeris kernel ({self.error})")
+        return self.planets[name]
+
+def opened(planets):
+    # The kernel behind planets, None when a LazyKernel could not open one
+    return planets.open() if isinstance(planets, LazyKernel) else planets
+
+# ------------------------ observers ------------------------
+
+def observer_key(loc) -> Optional[Tuple[float, float]]:
+    # None is the geocentre; topocentric locations at the same coordinates share one sweep
+    if not loc.topocentric: return None
+    if EPHEMERIS_BACKEND == "analytic":
+        print(f"{loc.key}: the analytic backend is geocentric only, ignoring topocentric")
+        return None
+    return (loc.lat, loc.lon)
+
+def observer_tables(ts, earth, sun, moon, okey, t0_utc, t1_utc, cache, geo: Optional[Dict[str, Transitions]] = None):
+    observer = earth if okey is None else earth + wgs84.latlon(*okey)
+    label = "geocentric" if okey is None else f"{okey[0]:.5f}_{okey[1]:.5f}"
+    if USE_CHEB_MODEL and EPHEMERIS_BACKEND == "bsp":
+        perf_caller("chebyshev fit", label)
+        # The diurnal parallax wobble needs shorter segments than the geocentric motion
+        models = fit_lon_models(ts, observer, sun, moon, t0_utc, t1_utc,
+                                seg_days=CHEB_SEGMENT_DAYS if okey is None else CHEB_TOPO_SEGMENT_DAYS)
+        install_lon_models(models)
+        # Elongation never advances slower than ~0.4"/s, which turns the arcsec bound into a time bound
+        m_err = models[(id(observer), id(moon))].max_err_deg * 3600.0
+        print(f"Chebyshev model ({label}): sun ±{models[(id(observer), id(sun))].max_err_deg * 3600.0:.1e}\", "
+              f"moon ±{m_err:.1e}\" (≈ ±{m_err / 0.4:.1e}s on transition times)")
+    perf_caller("main sweep", label)
+    group = "sweep" if okey is None else f"sweep_topo_{label}"
+    series = ALL_SERIES if okey is None else TOPO_SERIES
+    series = series + ayanamsa_series(AYANAMSA_SET, series)
+    tables = cached_transitions(cache, group, t0_utc, t1_utc, lambda a, b: sweep_transitions(
+        ts, a, b, observer, sun, moon, series))
+    # A topocentric location overlays its moon tables on the geocentric ones (geo)
+    if okey is None: tables = with_almanac(tables, t0_utc, t1_utc)
+    else: tables = dict(geo, **{ser.name: tables[ser.name] for ser in series})
+    return observer, tables, sankranti_index(tables["solar_rasi"])
+
 def main():
-    ts = load.timescale()
-    planets = load("de421.bsp")
-    earth, moon, sun = planets["earth"], planets["moon"], planets["sun"]
-    
+    ts = load_timescale()
     now = datetime.now(UTC)
-    t0 = now - timedelta(days=3)
-    t1 = now + timedelta(days=DAYS_AHEAD+50)
-    
-    def ft(t): return tithi_idx(t, earth, sun, moon)
-    ft.step_days = DISCRETE_STEP_DAYS
-    tch, tv = precompute_discrete(ts, t0, t1, ft)
+    # The analytic backend opens the kernel only once rise/set or a transit asks for it, and a
+    # kernel that cannot be opened turns the bsp backend into the analytic one
+    planets = LazyKernel(ts, *ephemeris_span(now))
+    if EPHEMERIS_BACKEND == "bsp" and planets.open() is None:
+        print("Falling back to EPHEMERIS_BACKEND=analytic")
+        use_analytic_backend()
+    bodies = ANALYTIC_BODIES if EPHEMERIS_BACKEND == "analytic" else planets
+    earth, moon, sun = bodies["earth"], bodies["moon"], bodies["sun"]
     
-    def fn(t): return nak_idx(t, earth, moon)
-    fn.step_days = DISCRETE_STEP_DAYS
-    nch, nv = precompute_discrete(ts, t0, t1, fn)
+    t0, t1 = sweep_horizon(now)
+
+    key = cache_key(planets.path)
+    cache = load_cache(CACHE_FILE, key)
+    # Every location needs the geocentric tables, topocentric ones included
+    observers = {None: observer_tables(ts, earth, sun, moon, None, t0, t1, cache)}
+    places: Dict[PlaceKey, PlaceAstronomy] = {}
+    perf_caller("transits")
+    transits = cached_transitions(cache, "transits", t0, t1, lambda a, b: planet_transits(ts, a, b, planets))
     
     for loc in LOCATIONS:
+        okey = observer_key(loc)
+        if okey not in observers: observers[okey] = observer_tables(ts, earth, sun, moon, okey, t0, t1, cache, observers[None][1])
+        observer, tables, sankrantis = observers[okey]
         print(f"Generating {loc.out_ics} ({loc.style}, {loc.lang})...")
-        cal = build_calendar(loc, ts, planets, earth, sun, moon, tch, tv, nch, nv)
+        pkey = place_key(loc, okey)
+        if pkey not in places: places[pkey] = place_astronomy(ts, planets, observer, sun, moon, loc, cache)
+        cal = build_calendar(loc, ts, observer, sun, tables, sankrantis, transits, places[pkey])
         with open(loc.out_ics, "w", encoding="utf-8") as f:
             f.write(cal.serialize())
+
+    save_cache(CACHE_FILE, key, cache)
+    if PERF or PERF_JSON: perf_report()
             
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Indian Panchangam ICS generator")
+    parser.add_argument("--build-excerpt", nargs=2, metavar=("START", "END"),
+                        help=f"write {EXCERPT_FILE} covering START..END (YYYY-MM-DD) and exit")
+    parser.add_argument("--build-timescale", action="store_true",
+                        help=f"write {TIMESCALE_FILE} from skyfield's bundled delta-T/leap-second tables and exit")
+    parser.add_argument("--build-almanac", nargs=2, metavar=("START", "END"),
+                        help=f"write {ALMANAC_FILE} with every sankranti and syzygy in START..END (YYYY-MM-DD) and exit")
+    parser.add_argument("--transits", nargs=2, metavar=("START", "END"),
+                        help="list Guru/Sani/Rahu/Ketu rasi ingresses in START..END (YYYY-MM-DD) and exit")
+    parser.add_argument("--ayanamsa-report", action="store_true",
+                        help=f"compare transitions under every ayanamsa ({', '.join(AYANAMSAS)}) and exit")
+    parser.add_argument("--accuracy-report", action="store_true",
+                        help="compare transition times of the fast tier and the analytic backend "
+                             "against the exact kernel run, and hour-angle sunrise against the search, "
+                             "over the horizon and exit")
+    args = parser.parse_args()
+    if args.build_timescale:
+        build_timescale_file()
+    elif args.build_excerpt:
+        build_ephemeris_excerpt(load_timescale(), *(date.fromisoformat(x) for x in args.build_excerpt))
+    elif args.transits:
+        ts = load_timescale()
+        t0, t1 = (UTC.localize(datetime.combine(date.fromisoformat(x), time(0, 0))) for x in args.transits)
+        planets, _ = load_ephemeris(ts, t0, t1)
+        x = perf_counter()
+        tr = planet_transits(ts, t0, t1, planets)
+        print(f"{sum(len(tr[b][0]) for b in TRANSIT_BODIES)} transits in {perf_counter() - x:.2f}s")
+        for t, body, rasi, retro in sorted((t, b, v, r) for b in TRANSIT_BODIES for (t, v), r in zip(zip(*tr[b]), tr[f"{b}_retro"][1])):
+            print(f"{t:%Y-%m-%d %H:%M:%S} UTC  {transit_title(body, rasi, retro, 'TA')[2:]}")
+    elif args.build_almanac:
+        build_almanac(load_timescale(), *(date.fromisoformat(x) for x in args.build_almanac))
+    elif args.accuracy_report or args.ayanamsa_report:
+        ts = load_timescale()
+        now = datetime.now(UTC)
+        planets, _ = load_ephemeris(ts, *ephemeris_span(now))
+        report = accuracy_report if args.accuracy_report else ayanamsa_report
+        report(ts, planets["earth"], planets["sun"], planets["moon"], *sweep_horizon(now))
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+from skyfield.api import load
+from skyfield.jpllib import SpiceKernel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(scope="session")
+def ts():
+    return load.timescale()
+
+@pytest.fixture(scope="session")
+def planets():
+    path = os.path.join(ROOT, "de421.bsp")
+    if not os.path.exists(path): pytest.skip("de421.bsp is missing")
+    return SpiceKernel(path)
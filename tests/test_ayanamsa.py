@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import generate as g
+
+# ------------------------ definitions ------------------------
+
+@pytest.mark.parametrize("name, tt, expected", [
+    ("lahiri", g.J2000_TT, 23.85675),
+    ("kp", g.J1900_TT, 22.363889),
+    ("raman", g.J1900_TT, 21.01444),
+])
+def test_linear_ayanamsas_at_their_epochs(name, tt, expected):
+    assert g.AYANAMSAS[name](tt) == pytest.approx(expected, abs=1e-6)
+
+def test_true_chitra_stays_near_lahiri():
+    for year in (1900, 2000, 2026, 2050):
+        tt = g.J2000_TT + (year - 2000) * 365.25
+        assert abs(g.AYANAMSAS["true_chitra"](tt) - g.AYANAMSAS["lahiri"](tt)) * 60.0 < 3.0
+
+# ------------------------ AYANAMSA_SET tables ------------------------
+
+def test_kp_nakshatras_follow_lahiri_by_the_offset(ts, planets):
+    a, b = g.UTC.localize(datetime(2026, 1, 1)), g.UTC.localize(datetime(2026, 4, 1))
+    tables = g.sweep_transitions(ts, a, b, planets["earth"], planets["sun"], planets["moon"],
+                                 (g.NAKSHATRA,) + g.ayanamsa_series(["kp"]))
+    (ce, ve), (cf, vf) = tables["nakshatra"], tables["nakshatra@kp"]
+    # KP is about 5.75' below Lahiri, so the moon reaches each KP boundary some 10 minutes earlier
+    off = 1 if vf[0] == ve[1] else 0
+    n = min(len(ce) - off, len(cf))
+    assert vf[:n] == ve[off:off + n]
+    dt = g.utc_seconds(cf[:n]) - g.utc_seconds(ce[off:off + n])
+    assert -15 * 60 < dt.min() and dt.max() < -5 * 60
+
+# ------------------------ report ------------------------
+
+def test_report_flags_unaligned_tables(ts, monkeypatch, capsys):
+    t0 = g.UTC.localize(datetime(2026, 1, 1))
+    times = [t0 + timedelta(days=d) for d in (1, 2, 3)]
+    def sweep(ts, a, b, earth, sun, moon, series):
+        tables = {ser.name: (times, [1, 2, 3]) for ser in series}
+        tables["nakshatra@kp"] = (times, [7, 8, 9])
+        return tables
+    monkeypatch.setattr(g, "AYANAMSA", "lahiri")
+    monkeypatch.setattr(g, "AYANAMSAS", {n: g.AYANAMSAS[n] for n in ("lahiri", "kp")})
+    monkeypatch.setattr(g, "sweep_transitions", sweep)
+    g.ayanamsa_report(ts, None, None, None, t0, t0 + timedelta(days=4))
+    rows = {tuple(line.split()[:2]): line.split()[2:] for line in capsys.readouterr().out.splitlines() if "kp" in line.split()[1:2]}
+    assert rows[("nakshatra", "kp")] == ["3", "unaligned"]
+    assert rows[("pada", "kp")] == ["3", "0.00", "0.00"]
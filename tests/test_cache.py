@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import generate as g
+
+def utc(*args): return g.UTC.localize(datetime(*args))
+
+def hourly(a, b):
+    # A stand-in table: a change at every half past the hour, valued by the hour
+    t = a.replace(minute=30, second=0, microsecond=0)
+    t = t if t > a else t + timedelta(hours=1)
+    out = []
+    while t < b:
+        out.append(t)
+        t += timedelta(hours=1)
+    return {"x": (out, [d.hour for d in out])}
+
+@pytest.fixture
+def counted():
+    calls = []
+    def compute(a, b):
+        calls.append((a, b))
+        return hourly(a, b)
+    compute.calls = calls
+    return compute
+
+def test_cached_transitions_only_computes_the_uncovered_ends(counted):
+    cache = {}
+    a, b = utc(2026, 1, 1), utc(2026, 1, 3)
+    assert g.cached_transitions(cache, "grp", a, b, counted) == hourly(a, b)
+    assert counted.calls == [(a, b)]
+    # Wider on both sides: only the two ends are new
+    c, d = utc(2025, 12, 31), utc(2026, 1, 4)
+    assert g.cached_transitions(cache, "grp", c, d, counted) == hourly(c, d)
+    assert counted.calls[1:] == [(c, a), (b, d)]
+    # Inside the cached span: nothing to compute, and the entry shrinks to the request
+    assert g.cached_transitions(cache, "grp", a, b, counted) == hourly(a, b)
+    assert len(counted.calls) == 3
+    assert cache["grp__span"].tolist() == [a.timestamp(), b.timestamp()]
+
+def test_cache_round_trip_and_key_change(tmp_path, counted):
+    path = str(tmp_path / "sub" / "transitions.npz")
+    a, b = utc(2026, 1, 1), utc(2026, 1, 2)
+    cache = {}
+    g.cached_transitions(cache, "grp", a, b, counted)
+    g.save_cache(path, "key-1", cache)
+    loaded = g.load_cache(path, "key-1")
+    assert g.cached_transitions(loaded, "grp", a, b, counted) == hourly(a, b)
+    assert len(counted.calls) == 1
+    assert g.load_cache(path, "key-2") == {}
+    assert g.load_cache(str(tmp_path / "missing.npz"), "key-1") == {}
+
+@pytest.mark.parametrize("name, value", [("CHEB_DEGREE", 10), ("CHEB_SEGMENT_DAYS", 2.0), ("CHEB_TOPO_SEGMENT_DAYS", 0.25),
+                                         ("USE_CHEB_MODEL", False), ("ROOT_TOL_SECONDS", 0.01), ("ACCURACY_TIER", "fast"),
+                                         ("RISESET_ENGINE", "search"), ("RISESET_MAX_STEPS", 4)])
+def test_cache_key_covers_the_settings(monkeypatch, name, value):
+    key = g.cache_key(None)
+    monkeypatch.setattr(g, name, value)
+    assert g.cache_key(None) != key
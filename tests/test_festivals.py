@@ -0,0 +1,81 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+import pytz
+from skyfield import almanac
+from skyfield.searchlib import find_discrete
+
+import generate as g
+
+A, B = g.UTC.localize(datetime(2025, 1, 1)), g.UTC.localize(datetime(2031, 6, 1))
+LOCS = {loc.key: loc for loc in g.LOCATIONS}
+
+def seconds(dts): return np.array([d.timestamp() for d in dts])
+
+@pytest.fixture(scope="module")
+def tables(ts, planets):
+    return g.sweep_transitions(ts, A, B, planets["earth"], planets["sun"], planets["moon"], (g.TITHI, g.SOLAR_RASI, g.SYZYGY))
+
+@pytest.fixture(scope="module")
+def riseset(ts, planets):
+    return {key: g.RiseSetTable(ts, planets, loc) for key, loc in LOCS.items()}
+
+@pytest.mark.parametrize("find, phase", [(g.new_moons, 0), (g.full_moons, 2)])
+def test_syzygies_against_moon_phases(ts, planets, tables, find, phase):
+    times, phases = find_discrete(ts.from_datetime(A), ts.from_datetime(B), almanac.moon_phases(planets))
+    expected = [t for t, p in zip(times.utc_datetime(), phases) if p == phase]
+    got = find(tables["syzygy"], A, B)
+    assert len(got) == len(expected) > 70
+    # moon_phases measures the elongation in the ecliptic of date, the tables in the J2000 ecliptic
+    assert np.abs(seconds(got) - seconds(expected)).max() < 5.0
+
+def test_syzygies_start_the_new_and_full_moon_tithis(tables):
+    tithi = g.syzygies_from_tithi(tables["tithi"])
+    for find in (g.new_moons, g.full_moons):
+        a, b = find(tables["syzygy"], A, B), find(tithi, A, B)
+        assert len(a) == len(b) > 70
+        assert np.abs(seconds(a) - seconds(b)).max() < 2.0 * g.ROOT_TOL_SECONDS
+
+# ------------------------ ugadi ------------------------
+
+UGADI = {
+    "stuttgart-te": ["2025-03-30", "2026-03-19", "2027-04-07", "2028-03-26", "2029-03-15", "2030-04-03", "2031-03-23"],
+    # Hyderabad's 2026 Chaitra pratipada holds at no sunrise and starts after the one on 03-19
+    "india-te": ["2025-03-30", "2026-03-19", "2027-04-07", "2028-03-27", "2029-03-16", "2030-04-03", "2031-03-24"],
+}
+
+@pytest.mark.parametrize("key, expected", [(key, date.fromisoformat(d)) for key, dates in UGADI.items() for d in dates])
+def test_ugadi(tables, riseset, key, expected):
+    got = g.ugadi_civil_date(expected.year, riseset[key], tables["tithi"], tables["syzygy"], tables["solar_rasi"])
+    assert got == expected
+
+def test_ugadi_outside_the_tables(tables, riseset):
+    assert g.ugadi_civil_date(2024, riseset["india-te"], tables["tithi"], tables["syzygy"], tables["solar_rasi"]) is None
+    assert g.ugadi_civil_date(2032, riseset["india-te"], tables["tithi"], tables["syzygy"], tables["solar_rasi"]) is None
+
+def test_varalakshmi_needs_the_purnima_within_the_week():
+    # Friday 2027-08-13, Shukla Dasami of Sravana; the full moon follows on the 17th
+    hits = lambda p: [e.name for e in g.check_rich_festivals(LOCS["india-te"], date(2027, 8, 13), None, ("Sravana", 4), 10, 1, p)]
+    assert hits(g.UTC.localize(datetime(2027, 8, 17, 9))) == ["🎉 Varalakshmi Vratam"]
+    assert hits(None) == []
+
+# ------------------------ vratams ------------------------
+
+# Local start of every Sankatahara Chathurthi in Stuttgart from 2026-10-19 to 2027-10-19, as listed on
+# the day it starts.  The 2026-10-28 and 2027-04-24 ones begin after moonrise on either day
+SANKATAHARA = ["2026-10-28 20:37", "2026-11-27 05:19", "2026-12-26 15:35", "2027-01-25 03:40", "2027-02-23 17:19",
+               "2027-03-25 08:08", "2027-04-24 00:51", "2027-05-23 17:12", "2027-06-22 09:37", "2027-07-22 01:17",
+               "2027-08-20 15:23", "2027-09-19 03:39", "2027-10-18 14:22"]
+
+def test_sankatahara_chathurthi(tables, riseset):
+    table = riseset["stuttgart-ta"]
+    tz = pytz.timezone(table.loc.tz)
+    found = []
+    for i in range(365):
+        d = date(2026, 10, 19) + timedelta(days=i)
+        sr, ss = table(d)
+        for v in g.check_special_vratams_timed(d, sr, ss, *tables["tithi"]):
+            if v.name == "Sankatahara Chathurthi": found.append((d, v.start.astimezone(tz)))
+    assert [f"{s:%Y-%m-%d %H:%M}" for _, s in found] == SANKATAHARA
+    assert all(d == s.date() for d, s in found)
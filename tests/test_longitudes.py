@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import generate as g
+
+T0, T1 = g.UTC.localize(datetime(2026, 1, 1)), g.UTC.localize(datetime(2027, 1, 1))
+
+@pytest.fixture(scope="module")
+def bodies(planets):
+    return planets["earth"], planets["sun"], planets["moon"]
+
+def arcsec(a, b): return np.abs((a - b + 180.0) % 360.0 - 180.0) * 3600.0
+
+# ------------------------ chebyshev model ------------------------
+
+def test_cheb_fit_reproduces_the_ephemeris(ts, bodies):
+    earth, sun, moon = bodies
+    models = g.fit_lon_models(ts, earth, sun, moon, T0, T1)
+    tt = np.linspace(ts.from_datetime(T0).tt, ts.from_datetime(T1).tt, 4001)
+    for body in (sun, moon):
+        model = models[(id(earth), id(body))]
+        assert model.covers(tt).all()
+        assert model.max_err_deg * 3600.0 < 1e-3
+        assert arcsec(model(tt), g.ephemeris_lon(ts.tt_jd(tt), earth, body)).max() < 1e-3
+
+def test_apparent_lon_falls_back_outside_the_fit(ts, bodies, monkeypatch):
+    earth, sun, moon = bodies
+    monkeypatch.setattr(g, "_LON_MODELS", {})
+    g.install_lon_models(g.fit_lon_models(ts, earth, sun, moon, T0, T1))
+    model = g._LON_MODELS[(id(earth), id(moon))]
+    tt = np.array([model.tt0 - 10.0, model.tt0 + 10.0, model.tt1 + 10.0])
+    lon = g.apparent_lon(ts.tt_jd(tt), earth, moon)
+    exact = g.ephemeris_lon(ts.tt_jd(tt), earth, moon)
+    assert arcsec(lon[[0, 2]], exact[[0, 2]]).max() == 0.0
+    assert arcsec(lon[1], exact[1]) < 1e-3
+
+# ------------------------ accuracy tiers ------------------------
+
+@pytest.fixture
+def tier():
+    # set_accuracy_tier also drops the caches, so whatever a test switches to is undone cleanly
+    yield g.set_accuracy_tier
+    g.set_accuracy_tier("exact")
+
+def test_fast_tier_longitudes(ts, bodies, tier):
+    earth, sun, moon = bodies
+    t = ts.tt_jd(np.linspace(ts.utc(2026, 1, 1).tt, ts.utc(2036, 1, 1).tt, 20001))
+    exact = g.sun_moon_lon(t, earth, sun, moon)
+    tier("fast")
+    fast = g.sun_moon_lon(t, earth, sun, moon)
+    assert arcsec(fast[0], exact[0]).max() < 0.01
+    assert arcsec(fast[1], exact[1]).max() < 0.06
+
+def test_fast_tier_moves_no_transition_by_more_than_a_quarter_second(ts, bodies, tier):
+    a, b = g.UTC.localize(datetime(2026, 1, 1)), g.UTC.localize(datetime(2028, 1, 1))
+    exact = g.sweep_transitions(ts, a, b, *bodies)
+    tier("fast")
+    fast = g.sweep_transitions(ts, a, b, *bodies)
+    for ser in g.ALL_SERIES:
+        (ce, ve), (cf, vf) = exact[ser.name], fast[ser.name]
+        assert vf == ve, ser.name
+        assert np.abs(g.utc_seconds(cf) - g.utc_seconds(ce)).max() <= 0.25, ser.name
+
+# ------------------------ analytic backend ------------------------
+
+@pytest.mark.parametrize("target, bound", [(10, 0.8), (301, 20.0)])
+def test_analytic_lon_against_de421(ts, bodies, target, bound):
+    earth, sun, moon = bodies
+    tt = np.linspace(ts.utc(1900, 1, 1).tt, ts.utc(2050, 1, 1).tt, 60001)
+    exact = g.ephemeris_lon(ts.tt_jd(tt), earth, sun if target == 10 else moon)
+    assert arcsec(g.analytic_lon(tt, target), exact).max() < bound
+
+def test_analytic_transitions(ts, bodies):
+    a, b = g.UTC.localize(datetime(2026, 1, 1)), g.UTC.localize(datetime(2028, 1, 1))
+    exact = g.sweep_transitions(ts, a, b, *bodies)
+    analytic = g.sweep_transitions(ts, a, b, *(g.ANALYTIC_BODIES[k] for k in ("earth", "sun", "moon")))
+    for ser in g.ALL_SERIES:
+        (ce, ve), (ca, va) = exact[ser.name], analytic[ser.name]
+        assert va == ve, ser.name
+        dt = np.abs(g.utc_seconds(ca) - g.utc_seconds(ce)).max()
+        assert dt <= (6.0 if ser is g.SOLAR_RASI else 25.0), ser.name
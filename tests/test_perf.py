@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import generate as g
+
+T0, T1 = g.UTC.localize(datetime(2026, 1, 1)), g.UTC.localize(datetime(2026, 2, 1))
+
+@pytest.fixture
+def perf(monkeypatch):
+    monkeypatch.setattr(g, "_PERF", {})
+    monkeypatch.setattr(g, "_PERF_SCOPE", ["test", "-", 0.0])
+    return lambda: {k: v for (_, _, k), v in g._PERF.items()}
+
+def test_longitudes_are_counted_by_body_name(ts, planets, perf, monkeypatch):
+    earth, sun, moon = planets["earth"], planets["sun"], planets["moon"]
+    monkeypatch.setattr(g, "_LON_CACHE", {})
+    monkeypatch.setattr(g, "_LON_MODELS", {})
+    t = ts.tt_jd(np.linspace(ts.from_datetime(T0).tt, ts.from_datetime(T1).tt, 50))
+    g.sun_moon_lon(t, earth, sun, moon)
+    g.ephemeris_lon(t, earth, planets["jupiter barycenter"])
+    assert {k: v[1] for k, v in perf().items()} == {"observe(sun)": 50, "observe(moon)": 50, "observe(jupiter barycenter)": 50}
+    g.install_lon_models(g.fit_lon_models(ts, earth, sun, moon, T0, T1))
+    g.sun_moon_lon(t, earth, sun, moon)
+    assert perf()["chebyshev(sun)"][:2] == perf()["chebyshev(moon)"][:2] == [1, 50]
+
+def test_find_discrete_counts_its_samples(ts, perf):
+    f = lambda t: np.floor(t.tt - 0.5).astype(int) % 2
+    f.step_days = 0.25
+    times, _ = g.find_discrete(ts.from_datetime(T0), ts.from_datetime(T1), f)
+    calls, points, _ = perf()["find_discrete"]
+    assert calls == 1 and len(times) == 31
+    assert points > 31 * 4
+
+def test_every_caller_gets_a_wall_row(perf):
+    g.perf_caller("lunar map", "x")
+    g.perf_caller("daily render", "x")
+    g.perf_caller("main")
+    assert {(c, l) for c, l, k in g._PERF if k == "wall"} == {("test", "-"), ("lunar map", "x"), ("daily render", "x")}
@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+import generate as g
+
+STUTTGART, HYDERABAD = g.LOCATIONS[0], g.LOCATIONS[2]
+SPANS = [(datetime(2026, 6, 1), datetime(2026, 7, 15)), (datetime(2026, 12, 1), datetime(2027, 1, 15))]
+
+def span(i): return tuple(g.UTC.localize(x) for x in SPANS[i])
+
+# ------------------------ hour-angle engine ------------------------
+
+@pytest.fixture(scope="module", params=range(len(SPANS)), ids=["summer", "winter"])
+def engines(request, ts, planets):
+    locs = [STUTTGART, HYDERABAD]
+    fast = g.sun_events_hour_angle(ts, planets, locs, *span(request.param))
+    return list(zip(locs, fast, (g.sun_events_search(ts, planets, loc, *span(request.param)) for loc in locs)))
+
+def test_hour_angle_sunrise_matches_the_search(engines):
+    for loc, fast, search in engines:
+        assert fast["sun"][1] == search["sun"][1], loc.key
+        assert np.abs(g.utc_seconds(fast["sun"][0]) - g.utc_seconds(search["sun"][0])).max() <= 0.001, loc.key
+
+@pytest.mark.parametrize("name", g.TWILIGHTS)
+def test_hour_angle_twilights_match_the_search(engines, name):
+    for loc, fast, search in engines:
+        cf, cs = g.utc_seconds(fast[name][0]), g.utc_seconds(search[name][0])
+        if name != "astronomical": assert fast[name][1] == search[name][1], loc.key
+        # The hourly search steps over brief summer dips below -18° that the engine resolves, so
+        # only ask that every searched event has its twin
+        i = np.searchsorted(cf, cs)
+        near = np.minimum(np.abs(cf[np.clip(i, 0, len(cf) - 1)] - cs), np.abs(cf[np.clip(i - 1, 0, len(cf) - 1)] - cs))
+        assert near.max() <= 0.001, loc.key
+
+@pytest.mark.parametrize("i", range(len(SPANS)))
+def test_analytic_sunrise_against_the_kernel(ts, planets, i):
+    locs = [STUTTGART, HYDERABAD]
+    kernel = g.sun_events_hour_angle(ts, planets, locs, *span(i))
+    analytic = g.sun_events_hour_angle(ts, None, locs, *span(i))
+    for k, a in zip(kernel, analytic):
+        assert a["sun"][1] == k["sun"][1]
+        assert np.abs(g.utc_seconds(a["sun"][0]) - g.utc_seconds(k["sun"][0])).max() < 0.1
+
+# ------------------------ rise/set table ------------------------
+
+def test_riseset_table_fills_lazily_by_block(ts, planets, monkeypatch):
+    calls = []
+    def counted(ts, planets, loc, start_d, end_d, cache=None):
+        calls.append((start_d, end_d))
+        return sun_events_range(ts, planets, loc, start_d, end_d, cache)
+    sun_events_range = g.sun_events_range
+    monkeypatch.setattr(g, "sun_events_range", counted)
+    table = g.RiseSetTable(ts, planets, STUTTGART)
+    d = date(2026, 3, 1)
+    sr, ss = table(d)
+    assert len(calls) == 1
+    half = timedelta(days=g.RISESET_BLOCK_DAYS // 2)
+    for x in (d - half, d + half): table(x)
+    assert len(calls) == 1
+    table(d + 2 * half + timedelta(days=2))
+    assert len(calls) == 2
+    sunr, suns, _ = sun_events_range(ts, planets, STUTTGART, d, d)
+    # A search over another window may settle elsewhere inside its tolerance
+    assert abs(sr - sunr[d]) < timedelta(milliseconds=1) and abs(ss - suns[d]) < timedelta(milliseconds=1)
+    assert sr.tzinfo.zone == STUTTGART.tz and sr.date() == ss.date() == d
+
+def test_twilights_and_muhurthams(ts, planets):
+    table = g.RiseSetTable(ts, planets, STUTTGART)
+    d = date(2026, 12, 21)
+    sr, ss = table(d)
+    dawns, dusks = zip(*(table.twilight(name, d) for name in g.TWILIGHTS))
+    assert list(dawns) == sorted(dawns, reverse=True) and max(dawns) < sr
+    assert list(dusks) == sorted(dusks) and min(dusks) > ss
+    m = table.night_muhurtham(d)
+    assert m == (sr - table(d - timedelta(days=1))[1]) / 15
+    assert table.brahma_muhurtham(d) == (sr - 2 * m, sr - m)
+    assert table.arunodaya(d) == (sr - 2 * m, sr)
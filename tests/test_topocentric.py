@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import generate as g
+
+A, B = g.UTC.localize(datetime(2026, 3, 1)), g.UTC.localize(datetime(2026, 5, 1))
+HYDERABAD = (17.385, 78.4867)
+
+@pytest.fixture(scope="module")
+def observers(ts, planets):
+    earth, sun, moon = planets["earth"], planets["sun"], planets["moon"]
+    models = dict(g._LON_MODELS)
+    try:
+        geo = g.observer_tables(ts, earth, sun, moon, None, A, B, {})[1]
+        topo = g.observer_tables(ts, earth, sun, moon, HYDERABAD, A, B, {}, geo)[1]
+    finally:
+        g._LON_MODELS.clear(); g._LON_MODELS.update(models)
+    return geo, topo
+
+def test_topocentric_moon_tables_follow_the_geocentric_ones(observers):
+    geo, topo = observers
+    for name in ("nakshatra", "pada", "moon_rasi"):
+        (cg, vg), (ct, vt) = geo[name], topo[name]
+        assert vt == vg, name
+        # The horizontal parallax is under a degree, about two hours of lunar motion
+        dt = np.abs(g.utc_seconds(ct) - g.utc_seconds(cg))
+        assert 0.0 < dt.max() < 2 * 3600.0, name
+
+def test_topocentric_locations_keep_the_geocentric_tithi(observers):
+    geo, topo = observers
+    for name in ("tithi", "karana", "yoga", "solar_rasi", "syzygy"):
+        assert topo[name] is geo[name], name
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from skyfield.searchlib import find_discrete
+
+import generate as g
+
+def utc(*args): return g.UTC.localize(datetime(*args))
+def seconds(dts): return np.array([d.timestamp() for d in dts])
+
+# ------------------------ table lookups ------------------------
+
+CHANGES = [utc(2026, 1, 1, 6), utc(2026, 1, 2, 7), utc(2026, 1, 3, 8)]
+VALUES = [5, 6, 7]
+
+def test_value_at():
+    assert g.value_at(utc(2026, 1, 1), CHANGES, VALUES) == 5   # before the table: its first value
+    assert g.value_at(CHANGES[0], CHANGES, VALUES) == 5        # a change takes effect at its instant
+    assert g.value_at(CHANGES[1] - timedelta(microseconds=1), CHANGES, VALUES) == 5
+    assert g.value_at(CHANGES[1], CHANGES, VALUES) == 6
+    assert g.value_at(utc(2027, 1, 1), CHANGES, VALUES) == 7
+
+def test_transitions_between_is_open_at_both_ends():
+    assert g.transitions_between(CHANGES[0], CHANGES[2], CHANGES, VALUES) == [(CHANGES[1], 6)]
+    assert g.transitions_between(utc(2026, 1, 1), utc(2026, 1, 4), CHANGES, VALUES) == list(zip(CHANGES, VALUES))
+    assert g.transitions_between(CHANGES[1], CHANGES[1], CHANGES, VALUES) == []
+
+# ------------------------ root finding ------------------------
+
+A, B = utc(2026, 3, 1), utc(2026, 5, 1)
+
+@pytest.fixture(scope="module")
+def sweep(ts, planets):
+    earth, sun, moon = planets["earth"], planets["sun"], planets["moon"]
+    return g.sweep_transitions(ts, A, B, earth, sun, moon, (g.TITHI, g.NAKSHATRA, g.PADA))
+
+@pytest.mark.parametrize("name", ["tithi", "nakshatra"])
+def test_sweep_matches_find_discrete(ts, planets, sweep, name):
+    earth, sun, moon = planets["earth"], planets["sun"], planets["moon"]
+    def f(t):
+        if name == "nakshatra": return g.nak_idx(t, earth, moon)
+        slon, mlon = g.sun_moon_lon(t, earth, sun, moon)
+        return (g.normalize_deg(mlon - slon) // 12.0).astype(int) + 1
+    f.step_days = 0.25
+    times, values = find_discrete(ts.from_datetime(A), ts.from_datetime(B), f)
+    changes, vals = sweep[name]
+    assert vals == values.tolist()
+    # find_discrete stops at 1 ms too, so the two may sit a tolerance apart either way
+    assert np.abs(seconds(changes) - seconds(times.utc_datetime())).max() < 2.0 * g.ROOT_TOL_SECONDS
+
+def test_sweep_steps_one_value_at_a_time(sweep):
+    for ser in (g.TITHI, g.NAKSHATRA):
+        changes, vals = sweep[ser.name]
+        assert changes == sorted(changes)
+        assert all((b - a) % ser.count == 1 for a, b in zip(vals, vals[1:]))
+
+# ------------------------ padas ------------------------
+
+def test_pada_changes_stop_at_the_nakshatra_by_value():
+    # Krithika 4 begins, then Rohini 1 lands a hair before Krithika's own end in the nakshatra table
+    pada = ([utc(2026, 1, 1, 9), utc(2026, 1, 1, 21, 59, 59, 999000), utc(2026, 1, 2, 3)], [12, 13, 14])
+    assert g.pada_changes(utc(2026, 1, 1, 7), utc(2026, 1, 2, 7), 3, pada) == [(utc(2026, 1, 1, 9), 12)]
+
+def test_pada_changes_across_nakshatra_changes(sweep):
+    n_ch, n_v = sweep["nakshatra"]
+    for t, v in zip(n_ch, n_v):
+        if not A + timedelta(days=1) < t < B - timedelta(days=1): continue
+        nak = (v - 2) % 27 + 1
+        a, b = t - timedelta(days=1), t + timedelta(days=1)
+        kept = g.pada_changes(a, b, nak, sweep["pada"])
+        dropped = [(x, p) for x, p in g.transitions_between(a, b, *sweep["pada"]) if (x, p) not in kept]
+        assert kept and kept[-1][1] == 4 * nak
+        # The first pada of the next nakshatra starts with it, whichever table got there first
+        assert dropped[0][1] == 4 * nak + 1 - 108 * (nak == 27)
+        assert abs((dropped[0][0] - t).total_seconds()) < 2.0 * g.ROOT_TOL_SECONDS
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import generate as g
+
+def utc(*args): return g.UTC.localize(datetime(*args))
+
+A, B = utc(2025, 1, 1), utc(2031, 1, 1)
+TOL = timedelta(seconds=2.0 * g.ROOT_TOL_SECONDS)
+
+@pytest.fixture(scope="module")
+def transits(ts, planets):
+    return g.planet_transits(ts, A, B, planets)
+
+def rasi_at(ts, fn, dts):
+    # Sidereal rasi of a transit body, straight from its longitude
+    tt = np.array([ts.from_datetime(d).tt for d in dts])
+    return (g.normalize_deg(fn(ts.tt_jd(tt)) - g.AYANAMSAS[g.AYANAMSA](tt)) // 30.0).astype(int)
+
+def test_guru_crosses_into_katakam_three_times(transits):
+    (times, rasis), (_, retro) = transits["Guru"], transits["Guru_retro"]
+    got = [(t, r, v) for t, r, v in zip(times, rasis, retro) if utc(2025, 10, 1) < t < utc(2026, 7, 1)]
+    assert [(f"{t:%Y-%m-%d}", r, v) for t, r, v in got] == [("2025-10-23", 3, 0), ("2025-11-30", 2, 1), ("2026-06-03", 3, 0)]
+    titles = [g.transit_title("Guru", r, v, "TA") for _, r, v in got]
+    assert titles[0].endswith("Mithunam → Katakam") and "Vakram" not in titles[0]
+    assert titles[1].endswith("(Vakram): Katakam → Mithunam")
+    assert titles[2] == titles[0]
+
+@pytest.mark.parametrize("body", ["Rahu", "Ketu"])
+def test_nodes_always_move_backwards(transits, body):
+    (times, rasis), (_, retro) = transits[body], transits[f"{body}_retro"]
+    assert len(times) >= 3 and all(retro)
+    assert all((a - b) % 12 == 1 for a, b in zip(rasis, rasis[1:]))
+    for lang in ("TA", "TE"):
+        for r in rasis:
+            title = g.transit_title(body, r, 1, lang)
+            assert title.endswith(f": {g.rasi_name((r + 1) % 12, lang)} → {g.rasi_name(r, lang)}")
+            assert g.get_label("Vakram", lang) not in title
+
+@pytest.mark.parametrize("body", g.TRANSIT_BODIES)
+def test_transits_against_an_hourly_scan(ts, planets, transits, body):
+    fn = g.transit_lon_fns(planets)[body]
+    times, rasis = transits[body]
+    hours = [A + timedelta(hours=h) for h in range(int((B - A).total_seconds() // 3600))]
+    scan = rasi_at(ts, fn, hours)
+    i = np.nonzero(np.diff(scan))[0]
+    # Every hourly change has its ingress inside that hour, with the same new rasi
+    assert [int(v) for v in scan[i + 1]] == rasis
+    assert all(hours[j] <= t <= hours[j + 1] for j, t in zip(i, times))
+    # and the bisection brackets the boundary to the root tolerance
+    before, after = rasi_at(ts, fn, [t - TOL for t in times]), rasi_at(ts, fn, [t + TOL for t in times])
+    assert after.tolist() == rasis and all(before != after)